@@ -0,0 +1,123 @@
+"""Import time of each ``python -m src`` subcommand, measured with ``-X importtime``.
+
+Every subcommand is measured in a fresh interpreter that imports the CLI plus
+the modules that subcommand loads before doing any work, so the numbers are
+the fixed start-up cost a scheduled job pays. Each measurement keeps the best
+of ``--repeat`` runs. With ``--budget`` the script exits non-zero when any
+subcommand exceeds its budget, so it can gate CI::
+
+    python -m benchmarks.import_times
+    python -m benchmarks.import_times --budget score=0.8 validate=1.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Modules each subcommand imports when it runs (see src/__main__.py).
+SUBCOMMAND_MODULES: Dict[str, List[str]] = {
+    "cli": [],
+    "pipeline": ["src.pipelines.preprocessing"],
+    "validate": ["pandera.errors", "src.utils.schema"],
+    "score": ["src.pipelines.feature_store"],
+    "experiments driver": ["src.models.driver_experiments"],
+    "experiments tuning": ["src.models.tuning"],
+    "experiments survival": ["src.models.survival"],
+    "report pdf": ["src.reporting.insight_pdf"],
+    "report slices": ["src.reporting.fanout"],
+}
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(stderr: str) -> Tuple[float, List[Tuple[str, float]]]:
+    """Total seconds (sum of top-level imports) and per-module self seconds."""
+    total = 0.0
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules.append((name, int(self_us) / 1e6))
+        if len(indent) == 1:
+            total += int(cumulative_us) / 1e6
+    return total, modules
+
+
+def measure(modules: Sequence[str], *, repeat: int) -> Dict[str, object]:
+    statement = "; ".join(f"import {module}" for module in ["src.__main__", *modules])
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statement],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        total, per_module = parse_importtime(result.stderr)
+        if best is None or total < best[0]:
+            best = (total, per_module)
+    total, per_module = best
+    slowest = sorted(per_module, key=lambda item: item[1], reverse=True)[:5]
+    return {
+        "import_seconds": total,
+        "modules_imported": len(per_module),
+        "slowest_self": [{"module": name, "seconds": seconds} for name, seconds in slowest],
+    }
+
+
+def parse_budgets(values: Sequence[str]) -> Dict[str, float]:
+    budgets = {}
+    for value in values:
+        name, _, seconds = value.rpartition("=")
+        if name not in SUBCOMMAND_MODULES:
+            raise SystemExit(f"Unknown subcommand in budget: {name!r}")
+        budgets[name] = float(seconds)
+    return budgets
+
+
+def run(repeat: int, budgets: Dict[str, float], output_dir: Path) -> int:
+    results = {}
+    over = []
+    for name, modules in SUBCOMMAND_MODULES.items():
+        results[name] = measure(modules, repeat=repeat)
+        seconds = results[name]["import_seconds"]
+        budget = budgets.get(name)
+        flag = ""
+        if budget is not None and seconds > budget:
+            over.append(name)
+            flag = f"  OVER BUDGET ({budget:.2f}s)"
+        slowest = results[name]["slowest_self"][0]["module"] if results[name]["slowest_self"] else "-"
+        print(f"{name:<22} {seconds:>7.3f}s  {results[name]['modules_imported']:>5} modules  slowest: {slowest}{flag}")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    path = output_dir / f"import_times_{stamp}.json"
+    path.write_text(json.dumps({"python": sys.version.split()[0], "budgets": budgets, "results": results}, indent=2))
+    print(f"Saved import times to {path}")
+    return 1 if over else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per subcommand (best is kept)")
+    parser.add_argument("--budget", nargs="*", default=[], metavar="SUBCOMMAND=SECONDS")
+    parser.add_argument("--output-dir", type=Path, default=RESULTS_DIR)
+    args = parser.parse_args(argv)
+    return run(args.repeat, parse_budgets(args.budget), args.output_dir)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,279 @@
+"""Load test for the dashboard query service across several dashboard processes.
+
+The service exists so that several Streamlit processes (replicas behind a
+load balancer, or restarts) share one warm cache. The test starts
+``--processes`` dashboard processes, each running ``--sessions`` concurrent
+analyst sessions that rerun the dashboard with filter states drawn from a
+shared, skewed pool (most people look at the same few views). Both setups
+keep a 64-entry cache per query function in every dashboard process, like the
+dashboard's ``st.cache_data`` helpers, and differ in what sits behind it:
+
+* ``memoised``: each process computes its own misses from its own copy of
+  the data (the dashboard without ``CHURN_QUERY_SERVICE_URL``);
+* ``service``: each process sends its misses to one shared
+  :class:`~src.reporting.query_service.QueryService` over HTTP, whose cache
+  and request coalescing are shared by every process.
+
+Reported per setup: aggregate reruns/s, rerun p50/p95 latency, how many
+aggregates were computed and the CPU seconds of all processes involved. The
+speed-up is the service's reruns/s over the memoised setup's.
+
+    python -m benchmarks.load_test --rows 1000000 --processes 4 --sessions 10 --reruns 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.pipelines import preprocessing
+from src.reporting.aggregations import SUPPORT_BAND_OPTIONS, filter_customers, geo_cube, province_summary_from_cube
+from src.reporting.figures import FIGURE_COLUMNS
+from src.reporting.query_service import QUERIES, QUERY_NAMES, QueryClient, QueryService, make_server
+from src.utils.cache import LRUCache
+from src.utils.synthetic import generate_subscribers, write_raw_csv
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+# max_entries of the dashboard's st.cache_data helpers.
+MEMOISED_MAX_ENTRIES = 64
+
+
+def clean_frame(n_rows: int, seed: int) -> pd.DataFrame:
+    """Run the preprocessing pipeline on synthetic subscribers.
+
+    Everything is written to a temporary directory; the partitioned store is
+    skipped so the real ``data/processed`` is never touched.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_path = Path(tmp) / "raw.csv"
+        write_raw_csv(generate_subscribers(n_rows, seed=seed), raw_path)
+        clean = preprocessing.run_pipeline(
+            raw_path,
+            Path(tmp) / "clean.csv",
+            Path(tmp) / "kpis.json",
+            partition_root=None,
+        )
+    return clean[FIGURE_COLUMNS]
+
+
+def filter_pool(clean: pd.DataFrame, size: int, seed: int) -> List[tuple]:
+    """Distinct filter states; sessions pick from them with Zipf-like weights."""
+    rng = np.random.default_rng(seed)
+    plans = sorted(clean["plan_type"].astype(str).unique())
+    provinces = sorted(clean["province"].astype(str).unique())
+    pool = [((), (), "All")]
+    while len(pool) < size:
+        state = (
+            tuple(sorted(rng.choice(plans, rng.integers(0, 3), replace=False))),
+            tuple(sorted(rng.choice(provinces, rng.integers(0, 3), replace=False))),
+            str(rng.choice(SUPPORT_BAND_OPTIONS)),
+        )
+        if state not in pool:
+            pool.append(state)
+    return pool
+
+
+def in_process_query(clean: pd.DataFrame) -> Callable:
+    cube = geo_cube(clean)
+
+    def query(name, plans, provinces, support_band):
+        if name == "geo":
+            return province_summary_from_cube(cube, plans, provinces, support_band)
+        return QUERIES[name](filter_customers(clean, plans, provinces, support_band))
+
+    return query
+
+
+def memoised_query(compute: Callable) -> Tuple[Callable, Dict[str, int]]:
+    """``compute`` behind one LRU per query function, without coalescing.
+
+    Returns the query function and a counter of the misses it passed on.
+    """
+    caches = {name: LRUCache(MEMOISED_MAX_ENTRIES) for name in QUERY_NAMES}
+    misses = {"computed": 0}
+    lock = threading.Lock()
+    missing = object()
+
+    def query(name, plans, provinces, support_band):
+        key = (plans, provinces, support_band)
+        result = caches[name].get(key, missing)
+        if result is missing:
+            result = compute(name, plans, provinces, support_band)
+            caches[name].put(key, result)
+            with lock:
+                misses["computed"] += 1
+        return result
+
+    return query, misses
+
+
+def simulate(query: Callable, pool: List[tuple], *, sessions: int, reruns: int, seed: int) -> Dict[str, object]:
+    """Run ``sessions`` concurrent sessions, each issuing every section query per rerun."""
+    weights = 1.0 / np.arange(1, len(pool) + 1)
+    weights /= weights.sum()
+    latencies: List[float] = []
+    lock = threading.Lock()
+    start = threading.Barrier(sessions)
+
+    def session(index: int) -> None:
+        rng = np.random.default_rng(seed + index)
+        picks = rng.choice(len(pool), size=reruns, p=weights)
+        start.wait()
+        for pick in picks:
+            rerun_start = time.perf_counter()
+            for name in QUERY_NAMES:
+                query(name, *pool[pick])
+            elapsed = time.perf_counter() - rerun_start
+            with lock:
+                latencies.append(elapsed)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=sessions) as pool_executor:
+        list(pool_executor.map(session, range(sessions)))
+    return {"started": started, "finished": time.monotonic(), "latencies": latencies}
+
+
+def dashboard_process(mode, clean, url, pool, sessions, reruns, seed, barrier, results) -> None:
+    """One dashboard process: a memoised query layer and ``sessions`` concurrent sessions."""
+    cpu_start = time.process_time()
+    compute = in_process_query(clean) if mode == "memoised" else QueryClient(url).query
+    query, misses = memoised_query(compute)
+    barrier.wait()
+    run = simulate(query, pool, sessions=sessions, reruns=reruns, seed=seed)
+    results.put({**run, "computed": misses["computed"], "cpu_seconds": time.process_time() - cpu_start})
+
+
+def serve_queries(clean, ready, stop) -> None:
+    """Shared query service process; reports its cache stats and CPU time on ``stop``."""
+    service = QueryService(clean)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    cpu_start = time.process_time()
+    ready.put(server.server_port)
+    stop.wait()
+    server.shutdown()
+    server.server_close()
+    ready.put({**service.snapshot(), "cpu_seconds": time.process_time() - cpu_start})
+
+
+def run_dashboards(
+    mode: str, clean: pd.DataFrame, pool: List[tuple], *, processes: int, sessions: int, reruns: int, seed: int,
+    url: str = "",
+) -> Dict[str, object]:
+    """Run ``processes`` dashboard processes concurrently and pool their measurements."""
+    barrier = multiprocessing.Barrier(processes)
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(
+            target=dashboard_process,
+            args=(mode, clean if mode == "memoised" else None, url, pool, sessions, reruns, seed + 1000 * i,
+                  barrier, results),
+        )
+        for i in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    runs = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    latencies = [latency for run in runs for latency in run["latencies"]]
+    wall = max(run["finished"] for run in runs) - min(run["started"] for run in runs)
+    return {
+        "wall_seconds": wall,
+        "reruns_per_second": len(latencies) / wall,
+        "queries_per_second": len(latencies) * len(QUERY_NAMES) / wall,
+        "rerun_p50_seconds": float(np.percentile(latencies, 50)),
+        "rerun_p95_seconds": float(np.percentile(latencies, 95)),
+        "aggregates_computed": sum(run["computed"] for run in runs),
+        "cpu_seconds": sum(run["cpu_seconds"] for run in runs),
+    }
+
+
+def _print(label: str, stats: Dict[str, object]) -> None:
+    print(
+        f"{label:<10} {stats['reruns_per_second']:>8.1f} reruns/s  p95 {stats['rerun_p95_seconds']:.3f}s  "
+        f"{stats['aggregates_computed']:>5} computed  {stats['cpu_seconds']:>7.1f} CPU s"
+    )
+
+
+def run(rows: int, processes: int, sessions: int, reruns: int, pool_size: int, seed: int, output_dir: Path) -> Path:
+    clean = clean_frame(rows, seed)
+    pool = filter_pool(clean, pool_size, seed)
+    print(
+        f"{len(clean):,} customers, {processes} dashboard processes x {sessions} sessions x {reruns} reruns, "
+        f"{len(pool)} filter states"
+    )
+    kwargs = dict(processes=processes, sessions=sessions, reruns=reruns, seed=seed)
+
+    baseline = run_dashboards("memoised", clean, pool, **kwargs)
+    _print("memoised", baseline)
+
+    ready, stop = multiprocessing.Queue(), multiprocessing.Event()
+    server = multiprocessing.Process(target=serve_queries, args=(clean, ready, stop))
+    server.start()
+    try:
+        url = f"http://127.0.0.1:{ready.get()}"
+        shared = run_dashboards("service", clean, pool, url=url, **kwargs)
+    finally:
+        stop.set()
+    cache = ready.get()
+    server.join()
+    # Dashboard-side misses are HTTP requests; the service computed its own misses.
+    shared["requests"] = shared["aggregates_computed"]
+    shared["aggregates_computed"] = cache["computed"]
+    shared["cpu_seconds"] += cache["cpu_seconds"]
+    _print("service", shared)
+    speed_up = shared["reruns_per_second"] / baseline["reruns_per_second"]
+    print(f"speed-up   {speed_up:.1f}x vs memoised")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    path = output_dir / f"load_test_{stamp}.json"
+    path.write_text(
+        json.dumps(
+            {
+                "rows": len(clean),
+                "processes": processes,
+                "sessions_per_process": sessions,
+                "reruns": reruns,
+                "filter_states": len(pool),
+                "memoised": baseline,
+                "service": {**shared, "cache": cache},
+                "speed_up_vs_memoised": speed_up,
+            },
+            indent=2,
+        )
+    )
+    print(f"Saved load test results to {path}")
+    return path
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--processes", type=int, default=4, help="Dashboard processes")
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent sessions per dashboard process")
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--filter-states", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output-dir", type=Path, default=RESULTS_DIR)
+    args = parser.parse_args(argv)
+    run(args.rows, args.processes, args.sessions, args.reruns, args.filter_states, args.seed, args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
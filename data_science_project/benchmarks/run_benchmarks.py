@@ -0,0 +1,260 @@
+"""Time and memory benchmarks for the pipeline, experiments and reporting layers.
+
+Runs every stage on synthetic subscribers from ``src.utils.synthetic`` at each
+requested size and writes one JSON file per run to ``benchmarks/results`` so
+runs from different commits on the same machine can be compared::
+
+    python -m benchmarks.run_benchmarks --sizes 10000 100000
+    python -m benchmarks.run_benchmarks compare results/a.json results/b.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.models import driver_experiments, survival
+from src.pipelines import feature_store, preprocessing
+from src.pipelines.kpis import compute_kpi_summary
+from src.reporting import aggregations, chart_data
+from src.utils.synthetic import generate_subscribers, write_raw_csv
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000, 10_000_000)
+# From this size on every stage runs once by default; a full pass takes minutes.
+LARGE_SIZE = 1_000_000
+
+
+def measure(func: Callable, *args, repeat: int = 1, **kwargs) -> Tuple[object, Dict[str, float]]:
+    """Return ``func``'s result with its best wall/CPU time and peak traced memory.
+
+    ``func`` runs ``repeat`` times in total. The first run is traced with
+    ``tracemalloc`` for peak memory and doubles as the first timing sample;
+    tracing slows it down, so with ``repeat > 1`` the best time normally
+    comes from one of the untraced runs.
+    """
+    walls, cpus = [], []
+
+    def timed():
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        output = func(*args, **kwargs)
+        walls.append(time.perf_counter() - wall_start)
+        cpus.append(time.process_time() - cpu_start)
+        return output
+
+    tracemalloc.start()
+    result = timed()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    for _ in range(repeat - 1):
+        timed()
+    return result, {
+        "wall_seconds": min(walls),
+        "cpu_seconds": min(cpus),
+        "peak_memory_mb": peak / 1e6,
+        "runs": len(walls),
+    }
+
+
+def default_repeat(n_rows: int) -> int:
+    """Runs per stage: the best of three below :data:`LARGE_SIZE` rows, a single run at or above it."""
+    return 3 if n_rows < LARGE_SIZE else 1
+
+
+def _pipeline_stages(raw_path: Path) -> List[Tuple[str, Callable]]:
+    return [
+        ("load_raw_dataset", lambda _: preprocessing.load_raw_dataset(raw_path)),
+        ("drop_duplicate_customers", preprocessing.drop_duplicate_customers),
+        ("impute_missing", preprocessing.impute_missing),
+        ("enforce_consistency", preprocessing.enforce_consistency),
+        ("cap_outliers", preprocessing.cap_outliers),
+        ("cast_dtypes", preprocessing.cast_dtypes),
+        ("derive_features", preprocessing.derive_features),
+    ]
+
+
+def _dashboard_aggregations() -> List[Tuple[str, Callable]]:
+    return [
+        ("filter_customers", lambda df: aggregations.filter_customers(df, ["Premium"], None, "High (>=0.5 tickets/mo)")),
+        ("monthly_churn_spend", aggregations.monthly_churn_spend),
+        ("churn_rate_by_plan", lambda df: aggregations.churn_rate_by(df, "plan_type")),
+        ("churn_rate_by_app", lambda df: aggregations.churn_rate_by(df, "has_app")),
+        ("support_band_churn", aggregations.support_band_churn),
+        ("province_summary", aggregations.province_summary),
+        ("geo_cube", aggregations.geo_cube),
+    ]
+
+
+def _chart_figures() -> List[Tuple[str, Callable]]:
+    # The synthetic data has no PCA coordinates, so two numeric columns stand
+    # in for pc1/pc2; payload size depends only on the row count and binning.
+    return [
+        (
+            "scatter_figure",
+            lambda df: chart_data.scatter_figure(
+                df, "monthly_charges", "next_month_spend", color="plan_type",
+                hover=["customer_id", "monthly_charges", "next_month_spend"],
+                mean_columns=["monthly_charges", "next_month_spend"],
+            ),
+        ),
+    ]
+
+
+def run_size(n_rows: int, *, repeat: int, seed: int, skip_models: bool) -> List[Dict[str, object]]:
+    """Benchmark every stage at one dataset size."""
+    records: List[Dict[str, object]] = []
+
+    def record(group: str, stage: str, func: Callable, *args, stage_repeat: int = repeat):
+        result, metrics = measure(func, *args, repeat=stage_repeat)
+        records.append({"group": group, "stage": stage, "rows": n_rows, **metrics})
+        print(f"{n_rows:>10,} {group:<12} {stage:<28} {metrics['wall_seconds']:>9.3f}s {metrics['peak_memory_mb']:>9.1f} MB")
+        return result
+
+    raw = record(
+        "synthetic", "generate_subscribers", lambda: generate_subscribers(n_rows, seed=seed), stage_repeat=1
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_path = Path(tmp) / "raw.csv"
+        write_raw_csv(raw, raw_path)
+        del raw
+        df = None
+        for stage, func in _pipeline_stages(raw_path):
+            df = record("pipeline", stage, func, df)
+
+    record("reporting", "compute_kpi_summary", compute_kpi_summary, df)
+    with tempfile.TemporaryDirectory() as tmp:
+        record("features", "build_feature_store", feature_store.build_feature_store, df, Path(tmp))
+        store = feature_store.FeatureStore(Path(tmp))
+        ids = np.random.default_rng(seed).choice(df["customer_id"].to_numpy(), size=1_000)
+        record("features", "get_many_1000", store.get_many, ids, ["monthly_charges", "tenure_months"])
+    for stage, func in _dashboard_aggregations():
+        record("dashboard", stage, func, df)
+    for stage, func in _chart_figures():
+        fig = record("charts", stage, func, df)
+        size = chart_data.payload_bytes(fig)
+        records[-1]["payload_bytes"] = size
+        over = "  OVER BUDGET" if size > chart_data.PAYLOAD_BUDGET_BYTES else ""
+        print(f"{n_rows:>10,} {'charts':<12} {stage + ' payload':<28} {size / 1e6:>8.2f} MB{over}")
+
+    # The synthetic data has no retention segments; app adoption stands in as the third stratum.
+    strata = ["province", "plan_type", "has_app"]
+    curves = record("survival", "kaplan_meier", survival.kaplan_meier, df, strata)
+    record("survival", "fit_discrete_hazard", survival.fit_discrete_hazard, curves, strata)
+
+    if not skip_models:
+        engineered = record("experiments", "engineer_driver_features", driver_experiments.engineer_driver_features, df)
+        record("experiments", "run_churn_experiment", driver_experiments.run_churn_experiment, engineered, stage_repeat=1)
+        record(
+            "experiments", "run_boosted_churn_experiment", driver_experiments.run_boosted_churn_experiment,
+            engineered, stage_repeat=1,
+        )
+        record(
+            "experiments", "run_text_churn_experiment", driver_experiments.run_text_churn_experiment,
+            engineered, stage_repeat=1,
+        )
+        record("experiments", "run_spend_experiment", driver_experiments.run_spend_experiment, engineered, stage_repeat=1)
+    return records
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(sizes, *, repeat: Optional[int] = None, seed: int = 42, skip_models: bool = False, output_dir: Path = RESULTS_DIR) -> Path:
+    """Run the suite for every size and persist a JSON result file.
+
+    ``repeat`` is the number of runs per stage; ``None`` uses
+    :func:`default_repeat` for each size.
+    """
+    commit = _git_commit()
+    records = []
+    for n_rows in sizes:
+        size_repeat = default_repeat(n_rows) if repeat is None else repeat
+        records.extend(run_size(n_rows, repeat=size_repeat, seed=seed, skip_models=skip_models))
+
+    payload = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": {
+            "node": platform.node(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+        },
+        "results": records,
+    }
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    path = output_dir / f"{stamp}_{commit}.json"
+    path.write_text(json.dumps(payload, indent=2))
+    print(f"Saved benchmark results to {path}")
+    return path
+
+
+def compare(baseline_path: Path, candidate_path: Path, *, threshold: float = 1.2) -> int:
+    """Print wall-time ratios between two result files; return 1 if any stage regressed."""
+    baseline = json.loads(Path(baseline_path).read_text())
+    candidate = json.loads(Path(candidate_path).read_text())
+    if baseline["machine"]["node"] != candidate["machine"]["node"]:
+        print("Warning: results come from different machines; ratios are not comparable.")
+
+    key = lambda r: (r["group"], r["stage"], r["rows"])
+    before = {key(r): r for r in baseline["results"]}
+    regressions = 0
+    print(f"{'stage':<42} {'rows':>10} {'before':>9} {'after':>9} {'ratio':>6}")
+    for record in candidate["results"]:
+        previous = before.get(key(record))
+        if previous is None:
+            continue
+        ratio = record["wall_seconds"] / max(previous["wall_seconds"], 1e-9)
+        flag = "  REGRESSION" if ratio > threshold else ""
+        regressions += bool(flag)
+        print(
+            f"{record['group'] + '.' + record['stage']:<42} {record['rows']:>10,} "
+            f"{previous['wall_seconds']:>8.3f}s {record['wall_seconds']:>8.3f}s {ratio:>6.2f}{flag}"
+        )
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command")
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("candidate", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=1.2)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument(
+        "--repeat", type=int, help="Runs per stage, best is kept (default: 3, or 1 from 1M rows)"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-models", action="store_true", help="Skip driver experiment fits")
+    parser.add_argument("--output-dir", type=Path, default=RESULTS_DIR)
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        return compare(args.baseline, args.candidate, threshold=args.threshold)
+    run(args.sizes, repeat=args.repeat, seed=args.seed, skip_models=args.skip_models, output_dir=args.output_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
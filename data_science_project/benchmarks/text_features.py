@@ -0,0 +1,85 @@
+"""Throughput of the review text feature stage in reviews per second.
+
+Two workloads at the requested size:
+
+* ``distinct``: almost every review is unique (random phrases assembled from
+  the synthetic snippets' words), so the hashing work itself is measured,
+  serially and on the process pool;
+* ``pipeline``: reviews as the synthetic pipeline produces them (a few
+  snippets plus "No review provided"), where deduplication dominates.
+
+    python -m benchmarks.text_features --rows 2000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from src.models.text_features import NEGATIVE_WORDS, POSITIVE_WORDS, ReviewTextFeatures
+from src.utils.synthetic import REVIEW_SNIPPETS
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def distinct_reviews(rows: int, seed: int) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    words = np.asarray(
+        sorted({word.lower() for snippet in REVIEW_SNIPPETS for word in snippet.split()} | set(POSITIVE_WORDS) | set(NEGATIVE_WORDS))
+    )
+    lengths = rng.integers(4, 16, rows)
+    tokens = rng.choice(words, lengths.sum())
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    return pd.Series([" ".join(tokens[lo:hi]) for lo, hi in zip(bounds[:-1], bounds[1:])])
+
+
+def pipeline_reviews(rows: int, seed: int) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    choices = np.asarray([*REVIEW_SNIPPETS, "No review provided"], dtype=object)
+    return pd.Series(rng.choice(choices, rows))
+
+
+def reviews_per_second(texts: pd.Series, n_jobs) -> Dict[str, float]:
+    start = time.perf_counter()
+    features = ReviewTextFeatures(n_jobs=n_jobs).transform(texts)
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "reviews_per_second": len(texts) / seconds, "nnz": int(features.nnz)}
+
+
+def run(rows: int, seed: int, output_dir: Path) -> Path:
+    workloads = {"distinct": distinct_reviews(rows, seed), "pipeline": pipeline_reviews(rows, seed)}
+    results = {}
+    for workload, texts in workloads.items():
+        for label, n_jobs in (("serial", 1), ("pool", None)):
+            name = f"{workload}_{label}"
+            results[name] = reviews_per_second(texts, n_jobs)
+            print(f"{name:<18} {results[name]['seconds']:>8.2f}s  {results[name]['reviews_per_second']:>14,.0f} reviews/s")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    path = output_dir / f"text_features_{stamp}.json"
+    path.write_text(json.dumps({"rows": rows, "seed": seed, "cpus": os.cpu_count(), "results": results}, indent=2))
+    print(f"Saved text feature benchmark to {path}")
+    return path
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output-dir", type=Path, default=RESULTS_DIR)
+    args = parser.parse_args(argv)
+    run(args.rows, args.seed, args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
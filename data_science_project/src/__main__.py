@@ -0,0 +1,153 @@
+"""Unified command line for the churn project.
+
+    python -m src pipeline [--no-partitions] [--feature-store]
+    python -m src validate [data/raw/training_master_dataset.csv]
+    python -m src experiments {driver,tuning,survival} [args...]
+    python -m src score 1001 1002 [--ids-file ids.csv] [--output scores.csv]
+    python -m src report {pdf,slices} [args...]
+
+Only argparse and the standard library are imported up front. Each
+subcommand imports its own modules (pandas, pandera, pyarrow, sklearn,
+matplotlib) when it runs, so short scheduled jobs pay only for what they use.
+Arguments after an ``experiments``/``report`` target are passed to that
+module's own ``main``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+# Same default as src.pipelines.preprocessing.RAW_DATA_PATH, kept here so
+# ``validate`` does not import the pipeline.
+RAW_DATA_PATH = Path("data/raw/training_master_dataset.csv")
+SCORE_COLUMNS = ["churn_probability", "retention_segment", "cluster"]
+
+EXPERIMENTS: Dict[str, str] = {
+    "driver": "src.models.driver_experiments",
+    "tuning": "src.models.tuning",
+    "survival": "src.models.survival",
+}
+REPORTS: Dict[str, str] = {
+    "pdf": "src.reporting.insight_pdf",
+    "slices": "src.reporting.fanout",
+}
+
+
+def _run_pipeline(args) -> int:
+    from src.pipelines import preprocessing
+
+    cleaned = preprocessing.run_pipeline(
+        args.raw,
+        args.output,
+        partition_root=None if args.no_partitions else preprocessing.PARTITIONED_DATA_PATH,
+    )
+    print(f"Saved cleaned dataset with {len(cleaned):,} rows to {args.output}")
+    if args.feature_store:
+        from src.pipelines.feature_store import FEATURE_STORE_PATH, build_feature_store, load_segments
+
+        build_feature_store(cleaned, FEATURE_STORE_PATH, segments=load_segments())
+        print(f"Stored features for {len(cleaned):,} customers in {FEATURE_STORE_PATH}")
+    return 0
+
+
+def _run_validate(args) -> int:
+    from pandera.errors import SchemaErrors
+
+    from src.utils.schema import load_and_validate
+
+    try:
+        validated = load_and_validate(args.path)
+    except SchemaErrors as exc:
+        cases = exc.failure_cases
+        print(f"{len(cases):,} schema violations in {args.path}", file=sys.stderr)
+        print(cases.head(args.show).to_string(index=False), file=sys.stderr)
+        return 1
+    print(f"{len(validated):,} rows in {args.path} match the training master schema")
+    return 0
+
+
+def _read_ids(args) -> List[int]:
+    ids = list(args.customer_ids)
+    if args.ids_file is not None:
+        import pandas as pd
+
+        frame = pd.read_csv(args.ids_file)
+        column = "customer_id" if "customer_id" in frame.columns else frame.columns[0]
+        ids.extend(frame[column].dropna().astype("int64").tolist())
+    return ids
+
+
+def _run_score(args) -> int:
+    from src.pipelines.feature_store import FeatureStore
+
+    store = FeatureStore(args.root)
+    columns = args.columns or [column for column in SCORE_COLUMNS if column in store.columns]
+    scores = store.get_many(_read_ids(args), columns)
+    missing = int(scores.isna().all(axis=1).sum())
+    if args.output is None:
+        sys.stdout.write(scores.to_csv())
+    else:
+        scores.to_csv(args.output)
+        print(f"Scored {len(scores) - missing:,} customers to {args.output}")
+    if missing:
+        print(f"{missing:,} customer ids are not in the feature store", file=sys.stderr)
+    return 0
+
+
+def _run_module(modules: Dict[str, str]):
+    def run(args) -> int:
+        importlib.import_module(modules[args.target]).main(args.args)
+        return 0
+
+    return run
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src", description="Churn project command line.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pipeline = subparsers.add_parser("pipeline", help="Clean the raw dataset and refresh derived stores")
+    pipeline.add_argument("--raw", type=Path, default=RAW_DATA_PATH)
+    pipeline.add_argument("--output", type=Path, default=Path("data/processed/clean_dataset.csv"))
+    pipeline.add_argument("--no-partitions", action="store_true", help="Skip the month-partitioned store")
+    pipeline.add_argument(
+        "--feature-store", action="store_true", help="Also rebuild the per-customer feature store"
+    )
+    pipeline.set_defaults(handler=_run_pipeline)
+
+    validate = subparsers.add_parser("validate", help="Check a raw extract against the pandera schema")
+    validate.add_argument("path", type=Path, nargs="?", default=RAW_DATA_PATH)
+    validate.add_argument("--show", type=int, default=20, help="Failure cases to print")
+    validate.set_defaults(handler=_run_validate)
+
+    for name, modules, help_text in (
+        ("experiments", EXPERIMENTS, "Run a modelling experiment"),
+        ("report", REPORTS, "Build the insight PDF or per-slice reports"),
+    ):
+        command = subparsers.add_parser(name, help=help_text)
+        command.add_argument("target", choices=sorted(modules))
+        command.add_argument("args", nargs=argparse.REMAINDER, help="Arguments for the target's own CLI")
+        command.set_defaults(handler=_run_module(modules))
+
+    score = subparsers.add_parser("score", help="Look up churn scores in the feature store")
+    score.add_argument("customer_ids", type=int, nargs="*")
+    score.add_argument("--ids-file", type=Path, help="CSV with a customer_id column (or ids in the first column)")
+    score.add_argument("--columns", nargs="+", help=f"Feature columns (default: {' '.join(SCORE_COLUMNS)})")
+    score.add_argument("--root", type=Path, default=Path("data/processed/feature_store"))
+    score.add_argument("--output", type=Path, help="Write scores to this CSV instead of stdout")
+    score.set_defaults(handler=_run_score)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
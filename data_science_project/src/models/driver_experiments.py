@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import argparse
 import json
+import time
 from pathlib import Path
 from typing import Dict
 
@@ -18,14 +20,28 @@ from sklearn.metrics import (
 )
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+from src.models.target_encoding import OutOfFoldTargetEncoder, target_encode
+from src.utils.instrumentation import instrument_stage
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 DATA_PATH = PROJECT_ROOT / "data" / "processed" / "clean_dataset.csv"
 REPORT_PATH = PROJECT_ROOT / "reports" / "model_driver_lift.json"
 
+DRIVER_NUMERIC_FEATURES = [
+    "monthly_charges",
+    "tenure_months",
+    "avg_session_minutes",
+    "support_tickets_per_month",
+]
+BOOSTED_NUMERIC_FEATURES = DRIVER_NUMERIC_FEATURES + ["has_app"]
+BOOSTED_CATEGORICAL_FEATURES = ["support_intensity", "province"]
+TEXT_FEATURE = "review_text"
+
 
+@instrument_stage("experiments")
 def engineer_driver_features(df: pd.DataFrame) -> pd.DataFrame:
     """Create driver-oriented features for modeling experiments."""
     engineered = df.copy()
@@ -38,20 +54,27 @@ def engineer_driver_features(df: pd.DataFrame) -> pd.DataFrame:
         include_lowest=True,
     )
 
-    province_churn = (
-        engineered.groupby("province")["churned"].mean().rename("province_churn_rate")
-    )
-    engineered = engineered.merge(
-        province_churn, on="province", how="left", validate="many_to_one"
+    # In-sample rate for profiling only; models encode province out-of-fold.
+    engineered["province_churn_rate"] = target_encode(
+        engineered["province"], engineered["churned"]
     )
 
     return engineered
 
 
 def make_preprocessor(
-    numeric_features: list[str], categorical_features: list[str]
+    numeric_features: list[str],
+    categorical_features: list[str],
+    target_encoded_features: list[str] | None = None,
+    text_feature: str | None = None,
 ) -> ColumnTransformer:
-    """Build a reusable column transformer."""
+    """Build a reusable column transformer.
+
+    ``target_encoded_features`` are replaced by their out-of-fold smoothed
+    target rate, fitted on the training split only. ``text_feature`` names a
+    free-text column expanded into sparse hashed n-gram and sentiment
+    features; the output then stays a sparse matrix.
+    """
     transformers = []
     if numeric_features:
         transformers.append(("num", StandardScaler(), numeric_features))
@@ -63,9 +86,114 @@ def make_preprocessor(
                 categorical_features,
             )
         )
+    if target_encoded_features:
+        transformers.append(
+            (
+                "te",
+                Pipeline(
+                    steps=[
+                        ("encode", OutOfFoldTargetEncoder()),
+                        ("scale", StandardScaler()),
+                    ]
+                ),
+                target_encoded_features,
+            )
+        )
+    if text_feature:
+        # Imported on use so runs without text features skip HashingVectorizer.
+        from src.models.text_features import ReviewTextFeatures
+
+        transformers.append(("text", ReviewTextFeatures(), text_feature))
+        return ColumnTransformer(transformers, sparse_threshold=1.0)
     return ColumnTransformer(transformers)
 
 
+def make_driver_churn_model(memory=None) -> Pipeline:
+    """Logistic churn model on the driver features.
+
+    ``province`` enters only as its out-of-fold target rate; ``has_app`` and
+    ``support_intensity`` are one-hot encoded.
+
+    ``memory`` is passed to :class:`~sklearn.pipeline.Pipeline` to cache the
+    fitted preprocessor, e.g. across tuning candidates.
+    """
+    return Pipeline(
+        steps=[
+            (
+                "preprocess",
+                make_preprocessor(
+                    numeric_features=DRIVER_NUMERIC_FEATURES,
+                    categorical_features=["has_app", "support_intensity"],
+                    target_encoded_features=["province"],
+                ),
+            ),
+            ("clf", LogisticRegression(max_iter=500, solver="lbfgs")),
+        ],
+        memory=memory,
+    )
+
+
+def make_text_churn_model(memory=None) -> Pipeline:
+    """Driver churn model plus hashed ``review_text`` features, fitted on sparse input."""
+    return Pipeline(
+        steps=[
+            (
+                "preprocess",
+                make_preprocessor(
+                    numeric_features=DRIVER_NUMERIC_FEATURES,
+                    categorical_features=["has_app", "support_intensity"],
+                    target_encoded_features=["province"],
+                    text_feature=TEXT_FEATURE,
+                ),
+            ),
+            ("clf", LogisticRegression(max_iter=500, solver="lbfgs")),
+        ],
+        memory=memory,
+    )
+
+
+def make_boosted_churn_model(random_state: int = 42, memory=None) -> Pipeline:
+    """Histogram gradient boosting with native categorical splits.
+
+    Categorical drivers are ordinal-encoded (unknown levels become missing)
+    and split on directly by the trees, so no one-hot expansion is needed.
+    Early stopping holds out 10% of the training rows.
+    """
+    from sklearn.ensemble import HistGradientBoostingClassifier
+
+    preprocessor = ColumnTransformer(
+        [
+            (
+                "cat",
+                OrdinalEncoder(
+                    handle_unknown="use_encoded_value",
+                    unknown_value=np.nan,
+                    encoded_missing_value=np.nan,
+                ),
+                BOOSTED_CATEGORICAL_FEATURES,
+            ),
+            ("num", "passthrough", BOOSTED_NUMERIC_FEATURES),
+        ],
+        verbose_feature_names_out=False,
+    ).set_output(transform="pandas")
+    classifier = HistGradientBoostingClassifier(
+        categorical_features=BOOSTED_CATEGORICAL_FEATURES,
+        max_iter=500,
+        learning_rate=0.1,
+        early_stopping=True,
+        validation_fraction=0.1,
+        n_iter_no_change=20,
+        random_state=random_state,
+    )
+    return Pipeline(steps=[("preprocess", preprocessor), ("clf", classifier)], memory=memory)
+
+
+def split_churn(df: pd.DataFrame):
+    """Stratified train/test split shared by every churn experiment."""
+    return train_test_split(df, df["churned"], test_size=0.2, random_state=42, stratify=df["churned"])
+
+
+@instrument_stage("experiments")
 def run_churn_experiment(df: pd.DataFrame) -> Dict[str, float]:
     """Compare baseline vs driver-informed churn models."""
     baseline_features = ["monthly_charges", "tenure_months", "avg_session_minutes"]
@@ -74,28 +202,13 @@ def run_churn_experiment(df: pd.DataFrame) -> Dict[str, float]:
         "support_intensity",
         "province",
         "support_tickets_per_month",
-        "province_churn_rate",
     ]
 
-    X = df
-    y = df["churned"]
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
-    )
+    X_train, X_test, y_train, y_test = split_churn(df)
 
     baseline_preprocessor = make_preprocessor(
         numeric_features=baseline_features, categorical_features=[]
     )
-    driver_preprocessor = make_preprocessor(
-        numeric_features=[
-            "monthly_charges",
-            "tenure_months",
-            "avg_session_minutes",
-            "support_tickets_per_month",
-            "province_churn_rate",
-        ],
-        categorical_features=["has_app", "support_intensity", "province"],
-    )
 
     baseline_model = Pipeline(
         steps=[
@@ -103,12 +216,7 @@ def run_churn_experiment(df: pd.DataFrame) -> Dict[str, float]:
             ("clf", LogisticRegression(max_iter=200, solver="lbfgs")),
         ]
     )
-    driver_model = Pipeline(
-        steps=[
-            ("preprocess", driver_preprocessor),
-            ("clf", LogisticRegression(max_iter=500, solver="lbfgs")),
-        ]
-    )
+    driver_model = make_driver_churn_model()
 
     baseline_model.fit(X_train, y_train)
     driver_model.fit(X_train, y_train)
@@ -127,6 +235,48 @@ def run_churn_experiment(df: pd.DataFrame) -> Dict[str, float]:
     return results
 
 
+@instrument_stage("experiments")
+def run_boosted_churn_experiment(df: pd.DataFrame) -> Dict[str, float]:
+    """Gradient-boosted churn model on the same split as the logistic models."""
+    X_train, X_test, y_train, y_test = split_churn(df)
+    model = make_boosted_churn_model()
+
+    fit_start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - fit_start
+
+    predict_start = time.perf_counter()
+    preds = model.predict_proba(X_test)[:, 1]
+    predict_seconds = time.perf_counter() - predict_start
+
+    return {
+        "boosted_auc": roc_auc_score(y_test, preds),
+        "boosted_accuracy": accuracy_score(y_test, (preds >= 0.5).astype(int)),
+        "n_iter": int(model.named_steps["clf"].n_iter_),
+        "fit_seconds": fit_seconds,
+        "predict_rows_per_second": len(X_test) / max(predict_seconds, 1e-9),
+    }
+
+
+@instrument_stage("experiments")
+def run_text_churn_experiment(df: pd.DataFrame) -> Dict[str, float]:
+    """Driver churn model with the review text features on the shared split."""
+    X_train, X_test, y_train, y_test = split_churn(df)
+    model = make_text_churn_model()
+
+    fit_start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - fit_start
+    preds = model.predict_proba(X_test)[:, 1]
+
+    return {
+        "text_auc": roc_auc_score(y_test, preds),
+        "text_accuracy": accuracy_score(y_test, (preds >= 0.5).astype(int)),
+        "fit_seconds": fit_seconds,
+    }
+
+
+@instrument_stage("experiments")
 def run_spend_experiment(df: pd.DataFrame) -> Dict[str, float]:
     """Assess impact of driver features on next-month spend prediction."""
     baseline_features = ["monthly_charges", "tenure_months", "avg_session_minutes"]
@@ -180,26 +330,53 @@ def run_spend_experiment(df: pd.DataFrame) -> Dict[str, float]:
     return results
 
 
-def main() -> None:
-    df = pd.read_csv(DATA_PATH, parse_dates=["signup_date", "last_seen"])
+def merge_lift_report(updates: Dict[str, object], path: Path = REPORT_PATH) -> Dict[str, object]:
+    """Write ``updates`` into the lift report, keeping top-level blocks they do not replace.
+
+    The experiments and :mod:`src.models.tuning` both write here, so neither
+    may overwrite the whole file.
+    """
+    payload = json.loads(path.read_text()) if path.exists() else {}
+    payload.update(updates)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2))
+    return payload
+
+
+@instrument_stage("experiments", profile=False)
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Measure churn and spend lift from the behavioral drivers.")
+    parser.add_argument("--data", type=Path, default=DATA_PATH, help="Clean dataset CSV")
+    parser.add_argument(
+        "--skip-text", action="store_true", help="Skip the review text model (keeps its last reported block)"
+    )
+    args = parser.parse_args(argv)
+    df = pd.read_csv(args.data, parse_dates=["signup_date", "last_seen"])
     df = engineer_driver_features(df)
 
     churn_results = run_churn_experiment(df)
+    boosted_results = run_boosted_churn_experiment(df)
+    boosted_results["auc_lift_vs_driver"] = boosted_results["boosted_auc"] - churn_results["driver_auc"]
     spend_results = run_spend_experiment(df)
 
     payload = {
         "churn_model": churn_results,
+        "boosted_churn_model": boosted_results,
         "spend_model": spend_results,
         "rows_used": len(df),
         "features_engineered": [
             "support_intensity",
-            "province_churn_rate",
+            "province_churn_rate (out-of-fold target encoding)",
             "has_app (binary)",
+            "review_text (hashed n-grams + lexicon sentiment)",
         ],
     }
+    if not args.skip_text:
+        text_results = run_text_churn_experiment(df)
+        text_results["auc_lift_vs_driver"] = text_results["text_auc"] - churn_results["driver_auc"]
+        payload["text_churn_model"] = text_results
 
-    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    REPORT_PATH.write_text(json.dumps(payload, indent=2))
+    merge_lift_report(payload)
     print(json.dumps(payload, indent=2))
 
 
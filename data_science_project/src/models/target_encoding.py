@@ -0,0 +1,147 @@
+"""Out-of-fold smoothed target encoding for high-cardinality categorical drivers."""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.utils.validation import check_is_fitted
+
+
+def _as_frame(X) -> pd.DataFrame:
+    if isinstance(X, pd.DataFrame):
+        return X
+    return pd.DataFrame(np.asarray(X, dtype=object))
+
+
+def _smoothed_means(sums: np.ndarray, counts: np.ndarray, prior, smoothing: float) -> np.ndarray:
+    """Shrink per-level means towards ``prior`` with ``smoothing`` pseudo-counts."""
+    return (sums + smoothing * prior) / (counts + smoothing)
+
+
+def target_encode(
+    categories: pd.Series, target: pd.Series, *, smoothing: float = 0.0
+) -> np.ndarray:
+    """Encode each row with its level's (optionally smoothed) in-sample target mean.
+
+    Uses factorized codes and ``np.bincount`` rather than a groupby/merge, so row
+    order is preserved. The result includes each row's own target and is meant
+    for descriptive profiling; models should use :class:`OutOfFoldTargetEncoder`.
+    """
+    codes, uniques = pd.factorize(categories)
+    y = np.asarray(target, dtype=float)
+    known = codes >= 0
+    sums = np.bincount(codes[known], weights=y[known], minlength=len(uniques))
+    counts = np.bincount(codes[known], minlength=len(uniques)).astype(float)
+    prior = y.mean()
+    encoded = np.full(len(codes), prior)
+    encoded[known] = _smoothed_means(sums, counts, prior, smoothing)[codes[known]]
+    return encoded
+
+
+class OutOfFoldTargetEncoder(TransformerMixin, BaseEstimator):
+    """Smoothed mean-target encoder with out-of-fold training encodings.
+
+    ``fit_transform`` encodes every training row using statistics from the
+    other ``n_splits - 1`` folds only, so a row never sees its own label.
+    ``transform`` (validation/test/scoring data) uses statistics from the full
+    training set. Unseen and missing levels fall back to the training prior.
+
+    ``n_features_in_`` and (for DataFrames with string column names)
+    ``feature_names_in_`` describe the whole input, as in other sklearn
+    transformers; the encoded subset is ``columns_``.
+
+    Levels are factorized to integer codes and aggregated with ``np.bincount``
+    over a ``(fold, level)`` grid, which keeps fitting linear in rows and
+    suitable for tens of thousands of levels.
+    """
+
+    def __init__(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        *,
+        smoothing: float = 20.0,
+        n_splits: int = 5,
+        random_state: Optional[int] = 42,
+    ) -> None:
+        self.columns = columns
+        self.smoothing = smoothing
+        self.n_splits = n_splits
+        self.random_state = random_state
+
+    def _selected(self, frame: pd.DataFrame) -> list:
+        return list(frame.columns) if self.columns is None else list(self.columns)
+
+    def fit(self, X, y) -> "OutOfFoldTargetEncoder":
+        self._fit_encode(X, y, out_of_fold=False)
+        return self
+
+    def fit_transform(self, X, y=None, **fit_params) -> np.ndarray:
+        if y is None:
+            raise ValueError("OutOfFoldTargetEncoder requires y to fit.")
+        return self._fit_encode(X, y, out_of_fold=True)
+
+    def _fit_encode(self, X, y, *, out_of_fold: bool) -> Optional[np.ndarray]:
+        frame = _as_frame(X)
+        target = np.asarray(y, dtype=float)
+        n_rows = len(frame)
+        self.columns_ = self._selected(frame)
+        self.n_features_in_ = frame.shape[1]
+        if isinstance(X, pd.DataFrame) and all(isinstance(column, str) for column in frame.columns):
+            self.feature_names_in_ = np.asarray(frame.columns, dtype=object)
+        elif hasattr(self, "feature_names_in_"):
+            del self.feature_names_in_
+        self.prior_ = float(target.mean())
+        self.levels_ = []
+        self.encodings_ = []
+
+        if out_of_fold:
+            rng = np.random.default_rng(self.random_state)
+            folds = rng.permutation(n_rows) % self.n_splits
+            fold_sums = np.bincount(folds, weights=target, minlength=self.n_splits)
+            fold_counts = np.bincount(folds, minlength=self.n_splits).astype(float)
+            fold_priors = (target.sum() - fold_sums) / (n_rows - fold_counts)
+            output = np.empty((n_rows, len(self.columns_)))
+
+        for j, column in enumerate(self.columns_):
+            codes, uniques = pd.factorize(frame[column])
+            n_levels = len(uniques)
+            known = codes >= 0
+            sums = np.bincount(codes[known], weights=target[known], minlength=n_levels)
+            counts = np.bincount(codes[known], minlength=n_levels).astype(float)
+            self.levels_.append(pd.Index(uniques))
+            self.encodings_.append(_smoothed_means(sums, counts, self.prior_, self.smoothing))
+
+            if not out_of_fold:
+                continue
+            cell = folds[known] * n_levels + codes[known]
+            size = self.n_splits * n_levels
+            in_fold_sums = np.bincount(cell, weights=target[known], minlength=size)
+            in_fold_counts = np.bincount(cell, minlength=size).astype(float)
+            oof_sums = sums[None, :] - in_fold_sums.reshape(self.n_splits, n_levels)
+            oof_counts = counts[None, :] - in_fold_counts.reshape(self.n_splits, n_levels)
+            oof = _smoothed_means(oof_sums, oof_counts, fold_priors[:, None], self.smoothing)
+
+            column_out = fold_priors[folds].copy()
+            column_out[known] = oof[folds[known], codes[known]]
+            output[:, j] = column_out
+
+        return output if out_of_fold else None
+
+    def transform(self, X) -> np.ndarray:
+        check_is_fitted(self, "encodings_")
+        frame = _as_frame(X)
+        output = np.empty((len(frame), len(self.columns_)))
+        for j, column in enumerate(self.columns_):
+            codes = self.levels_[j].get_indexer(frame[column])
+            column_out = np.full(len(frame), self.prior_)
+            known = codes >= 0
+            column_out[known] = self.encodings_[j][codes[known]]
+            output[:, j] = column_out
+        return output
+
+    def get_feature_names_out(self, input_features=None) -> np.ndarray:
+        check_is_fitted(self, "encodings_")
+        return np.asarray([f"{column}_target_rate" for column in self.columns_], dtype=object)
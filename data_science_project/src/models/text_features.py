@@ -0,0 +1,118 @@
+"""Sparse text features from ``review_text``: hashed n-grams plus lexicon sentiment.
+
+``HashingVectorizer`` is stateless (no vocabulary is learned or held), so
+chunks of reviews can be vectorized independently on a process pool and
+stacked. Each review is tokenized once: the lexicon hit counts are read off
+the raw hashed counts at the lexicon words' hash columns, then the counts
+are L2-normalized as the n-gram features.
+
+Reviews repeat heavily (every imputed row reads "No review provided"), so
+distinct texts are vectorized once and rows are gathered from them.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+N_HASHED_FEATURES = 2**18
+DEFAULT_CHUNK_SIZE = 50_000
+POSITIVE_WORDS = (
+    "affordable", "best", "easy", "excellent", "fast", "good", "great", "happy", "helpful",
+    "love", "quick", "recommend", "reliable", "satisfied", "smooth", "strong",
+)
+NEGATIVE_WORDS = (
+    "bad", "cancel", "disappointed", "drop", "drops", "error", "errors", "expensive", "issues",
+    "long", "outage", "overcharged", "poor", "problem", "problems", "rude", "slow", "terrible",
+    "unreliable", "worst",
+)
+SENTIMENT_COLUMNS = ["positive_hits", "negative_hits", "sentiment_score"]
+
+
+def _vectorizer(n_features: int) -> HashingVectorizer:
+    return HashingVectorizer(
+        n_features=n_features, ngram_range=(1, 2), alternate_sign=False, norm=None, dtype=np.float32
+    )
+
+
+def _lexicon_weights(n_features: int) -> np.ndarray:
+    """Indicator columns selecting the positive (0) and negative (1) lexicon hash columns."""
+    # Each single-word document hashes to exactly one column, in word order.
+    columns = _vectorizer(n_features).transform([*POSITIVE_WORDS, *NEGATIVE_WORDS]).indices
+    weights = np.zeros((n_features, 2), dtype=np.float32)
+    weights[columns[: len(POSITIVE_WORDS)], 0] = 1.0
+    weights[columns[len(POSITIVE_WORDS):], 1] = 1.0
+    return weights
+
+
+def review_features(texts, n_features: int = N_HASHED_FEATURES) -> sp.csr_matrix:
+    """Hashed, L2-normalized n-gram counts followed by the three sentiment columns."""
+    counts = _vectorizer(n_features).transform(texts)
+    hits = np.asarray(counts @ _lexicon_weights(n_features))
+    positive, negative = hits[:, 0], hits[:, 1]
+    score = (positive - negative) / np.maximum(positive + negative, 1.0)
+    sentiment = np.column_stack([positive, negative, score]).astype(np.float32)
+    return sp.hstack([normalize(counts), sp.csr_matrix(sentiment)], format="csr")
+
+
+def _review_chunk(args) -> sp.csr_matrix:
+    texts, n_features = args
+    return review_features(texts, n_features)
+
+
+def _as_texts(X) -> pd.Series:
+    if isinstance(X, pd.DataFrame):
+        X = X.iloc[:, 0]
+    return pd.Series(np.asarray(X, dtype=object).ravel()).fillna("")
+
+
+class ReviewTextFeatures(TransformerMixin, BaseEstimator):
+    """Stateless sparse review features for use inside a ``ColumnTransformer``.
+
+    ``fit`` learns nothing. ``transform`` vectorizes the distinct texts in
+    chunks of ``chunk_size`` on ``n_jobs`` worker processes (``None`` uses
+    every core; one chunk or ``n_jobs=1`` stays in-process) and returns a CSR
+    matrix with ``n_features`` hashed columns plus :data:`SENTIMENT_COLUMNS`.
+    """
+
+    def __init__(
+        self,
+        n_features: int = N_HASHED_FEATURES,
+        *,
+        n_jobs: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        self.n_features = n_features
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X) -> sp.csr_matrix:
+        codes, uniques = pd.factorize(_as_texts(X))
+        chunks = [
+            (list(uniques[start:start + self.chunk_size]), self.n_features)
+            for start in range(0, len(uniques), self.chunk_size)
+        ]
+        workers = min(self.n_jobs or os.cpu_count() or 1, len(chunks))
+        if workers <= 1:
+            parts = [_review_chunk(chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(_review_chunk, chunks))
+        if not parts:
+            return sp.csr_matrix((len(codes), self.n_features + len(SENTIMENT_COLUMNS)), dtype=np.float32)
+        return sp.vstack(parts, format="csr")[codes]
+
+    def get_feature_names_out(self, input_features=None) -> np.ndarray:
+        return np.asarray([f"review_hash_{i}" for i in range(self.n_features)] + SENTIMENT_COLUMNS, dtype=object)
@@ -0,0 +1,160 @@
+"""Hyperparameter tuning for the churn models with successive halving.
+
+``HalvingRandomSearchCV`` scores many sampled configurations on small row
+subsamples and promotes only the best third to each larger budget, so most
+candidates never see the full training set. Only classifier parameters are
+searched, so the preprocessing step is identical across candidates; the
+pipelines are built with a shared ``joblib.Memory`` cache and each fold/budget
+fits its preprocessor once. Candidates run on all cores.
+
+    python -m src.models.tuning --models driver boosted
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from joblib import Memory
+from scipy.stats import loguniform, randint
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import HalvingRandomSearchCV, StratifiedKFold
+
+from src.models.driver_experiments import (
+    DATA_PATH,
+    REPORT_PATH,
+    engineer_driver_features,
+    make_boosted_churn_model,
+    make_driver_churn_model,
+    merge_lift_report,
+    split_churn,
+)
+from src.utils.instrumentation import instrument_stage
+
+
+# name -> (pipeline factory taking ``memory``, parameter distributions)
+SEARCH_SPACES: Dict[str, tuple] = {
+    "driver": (
+        lambda memory: make_driver_churn_model(memory=memory),
+        {
+            "clf__C": loguniform(1e-3, 1e2),
+            "clf__class_weight": [None, "balanced"],
+        },
+    ),
+    "boosted": (
+        lambda memory: make_boosted_churn_model(memory=memory),
+        {
+            "clf__learning_rate": loguniform(0.02, 0.3),
+            "clf__max_leaf_nodes": randint(15, 64),
+            "clf__min_samples_leaf": randint(20, 200),
+            "clf__l2_regularization": loguniform(1e-4, 10),
+        },
+    ),
+}
+
+
+def _jsonable(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+@instrument_stage("experiments")
+def tune_model(
+    df: pd.DataFrame,
+    model: str = "driver",
+    *,
+    n_candidates: int = 81,
+    min_resources: int = 5_000,
+    factor: int = 3,
+    cv: int = 3,
+    n_jobs: int = -1,
+    random_state: int = 42,
+    cache_dir: Optional[str] = None,
+) -> Dict[str, object]:
+    """Tune one churn model and score the refitted best pipeline on the test split.
+
+    Budgets are row subsamples starting at ``min_resources`` and growing by
+    ``factor`` per round. Returns the best parameters, CV and test AUC, and
+    the per-round candidate/row counts and timings.
+    """
+    make_pipeline, distributions = SEARCH_SPACES[model]
+    X_train, X_test, y_train, y_test = split_churn(df)
+    min_resources = min(min_resources, len(X_train))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = Memory(cache_dir or tmp, verbose=0)
+        search = HalvingRandomSearchCV(
+            make_pipeline(memory),
+            distributions,
+            n_candidates=n_candidates,
+            resource="n_samples",
+            min_resources=min_resources,
+            factor=factor,
+            cv=StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state),
+            scoring="roc_auc",
+            refit=True,
+            n_jobs=n_jobs,
+            random_state=random_state,
+        )
+        start = time.perf_counter()
+        search.fit(X_train, y_train)
+        search_seconds = time.perf_counter() - start
+        test_auc = roc_auc_score(y_test, search.predict_proba(X_test)[:, 1])
+
+    results = pd.DataFrame(search.cv_results_)
+    rounds = results.groupby("iter").agg(
+        candidates=("params", "size"),
+        rows=("n_resources", "first"),
+        mean_fit_seconds=("mean_fit_time", "mean"),
+    )
+    return {
+        "model": model,
+        "best_params": {key: _jsonable(value) for key, value in search.best_params_.items()},
+        "best_cv_auc": float(search.best_score_),
+        "test_auc": float(test_auc),
+        "search_seconds": search_seconds,
+        "refit_seconds": float(search.refit_time_),
+        "n_candidates": int(search.n_candidates_[0]),
+        "rounds": [
+            {"candidates": int(row.candidates), "rows": int(row.rows), "mean_fit_seconds": float(row.mean_fit_seconds)}
+            for row in rounds.itertuples()
+        ],
+    }
+
+
+def tune_models(df: pd.DataFrame, models: Sequence[str] = tuple(SEARCH_SPACES), **kwargs) -> Dict[str, object]:
+    return {model: tune_model(df, model, **kwargs) for model in models}
+
+
+def update_lift_report(tuning: Dict[str, object], path=REPORT_PATH) -> Dict[str, object]:
+    """Merge tuning results into the lift report written by ``driver_experiments``."""
+    previous = json.loads(path.read_text()).get("tuning", {}) if path.exists() else {}
+    return merge_lift_report({"tuning": {**previous, **tuning}}, path)
+
+
+@instrument_stage("experiments", profile=False)
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Tune the churn models with successive halving.")
+    parser.add_argument("--models", nargs="+", choices=sorted(SEARCH_SPACES), default=list(SEARCH_SPACES))
+    parser.add_argument("--candidates", type=int, default=81)
+    parser.add_argument("--min-rows", type=int, default=5_000, help="Rows in the first halving round")
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    args = parser.parse_args(argv)
+
+    df = engineer_driver_features(pd.read_csv(DATA_PATH, parse_dates=["signup_date", "last_seen"]))
+    tuning = tune_models(
+        df, args.models, n_candidates=args.candidates, min_resources=args.min_rows, n_jobs=args.n_jobs
+    )
+    update_lift_report(tuning)
+    print(json.dumps(tuning, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Per-customer feature store with point lookups by ``customer_id``.
+
+The store is a directory with two files, written by ``build`` below or
+``python -m src pipeline --feature-store``::
+
+    data/processed/feature_store/features.parquet   # rows sorted by customer_id
+    data/processed/feature_store/customer_ids.npy   # the sorted ids
+
+Lookups binary-search the memory-mapped id array (O(log n)) and decode only
+the Parquet row groups holding the requested customers, so scoring jobs, the
+dashboard and pilot exports never load the full clean/segmented CSVs.
+Recently read row groups are kept in a small LRU cache.
+
+    python -m src.pipelines.feature_store build
+    python -m src.pipelines.feature_store get 1001 1002 --columns churn_probability cluster
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import warnings
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.utils.cache import LRUCache
+
+
+FEATURE_STORE_PATH = Path("data/processed/feature_store")
+SEGMENTED_PATH = Path("data/processed/segmented.csv")
+FEATURES_FILE = "features.parquet"
+KEYS_FILE = "customer_ids.npy"
+KEY_COLUMN = "customer_id"
+SEGMENT_COLUMNS = ["cluster", "churn_probability", "retention_segment"]
+ENGINEERED_COLUMNS = ["has_app", "support_intensity", "province_churn_rate"]
+DEFAULT_ROW_GROUP_SIZE = 50_000
+DEFAULT_CACHED_ROW_GROUPS = 16
+
+
+def load_segments(path: Path = SEGMENTED_PATH) -> Optional[pd.DataFrame]:
+    """Cluster, churn probability and retention segment per customer, if exported.
+
+    Returns ``None`` when the export is missing; also warns and returns
+    ``None`` when it cannot be parsed or has no ``customer_id`` column (e.g.
+    an un-fetched Git LFS pointer), so the store is built without segments.
+    """
+    if not Path(path).exists():
+        return None
+    try:
+        header = pd.read_csv(path, nrows=0).columns
+        if KEY_COLUMN not in header:
+            warnings.warn(f"{path} has no {KEY_COLUMN} column; building the feature store without segments")
+            return None
+        columns = [KEY_COLUMN, *(column for column in SEGMENT_COLUMNS if column in header)]
+        return pd.read_csv(path, usecols=columns)
+    except (ValueError, pd.errors.ParserError) as exc:
+        warnings.warn(f"Could not read segments from {path} ({exc}); building the feature store without segments")
+        return None
+
+
+def build_feature_store(
+    clean: pd.DataFrame,
+    root: Path = FEATURE_STORE_PATH,
+    *,
+    segments: Optional[pd.DataFrame] = None,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> Path:
+    """Write the cleaned and engineered features (plus segments when given) to ``root``.
+
+    Engineered columns come from
+    :func:`src.models.driver_experiments.engineer_driver_features`: integer
+    ``has_app``, ``support_intensity`` and ``province_churn_rate`` (the
+    in-sample province rate used for profiling, not the out-of-fold encoding
+    fitted inside the models). ``segments`` is joined on ``customer_id``;
+    customers without a segment row get missing values. Existing store files
+    are overwritten.
+    """
+    # Imported here so importing the pipeline does not load scikit-learn.
+    from src.models.driver_experiments import engineer_driver_features
+
+    features = engineer_driver_features(clean)
+    if segments is not None:
+        extra = segments.drop(columns=[c for c in segments.columns if c in features.columns and c != KEY_COLUMN])
+        features = features.merge(extra.drop_duplicates(KEY_COLUMN), on=KEY_COLUMN, how="left")
+    features = features.sort_values(KEY_COLUMN, kind="stable").reset_index(drop=True)
+    keys = features[KEY_COLUMN].to_numpy(dtype=np.int64)
+    if len(keys) > 1 and not (np.diff(keys) > 0).all():
+        raise ValueError("customer_id must be unique to build the feature store")
+
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(features, preserve_index=False)
+    pq.write_table(table, root / FEATURES_FILE, row_group_size=row_group_size)
+    np.save(root / KEYS_FILE, keys)
+    return root
+
+
+class FeatureStore:
+    """Read-only lookups against a store written by :func:`build_feature_store`."""
+
+    def __init__(self, root: Path = FEATURE_STORE_PATH, *, cached_row_groups: int = DEFAULT_CACHED_ROW_GROUPS) -> None:
+        root = Path(root)
+        self.keys = np.load(root / KEYS_FILE, mmap_mode="r")
+        self._file = pq.ParquetFile(root / FEATURES_FILE)
+        metadata = self._file.metadata
+        sizes = [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+        # offsets[g] is the first row of row group g.
+        self._offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        self.columns: List[str] = self._file.schema_arrow.names
+        self._cache = LRUCache(cached_row_groups)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, customer_id) -> bool:
+        return bool(self._positions(np.asarray([customer_id], dtype=np.int64))[1][0])
+
+    def _positions(self, ids: np.ndarray):
+        positions = np.searchsorted(self.keys, ids)
+        found = positions < len(self.keys)
+        found[found] = self.keys[positions[found]] == ids[found]
+        return positions, found
+
+    def _row_group(self, group: int, columns: tuple) -> pd.DataFrame:
+        key = (group, columns)
+        frame = self._cache.get(key)
+        if frame is None:
+            with self._lock:
+                table = self._file.read_row_group(group, columns=list(columns))
+            frame = table.to_pandas()
+            self._cache.put(key, frame)
+        return frame
+
+    def _columns(self, columns: Optional[Sequence[str]]) -> tuple:
+        if columns is None:
+            return tuple(self.columns)
+        unknown = sorted(set(columns) - set(self.columns))
+        if unknown:
+            raise KeyError(f"Unknown feature columns: {unknown}")
+        return tuple(dict.fromkeys([KEY_COLUMN, *columns]))
+
+    def get_many(self, customer_ids: Iterable, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Feature rows indexed by ``customer_id`` in request order.
+
+        Unknown ids come back as all-missing rows.
+        """
+        ids = np.asarray(list(customer_ids), dtype=np.int64)
+        columns = self._columns(columns)
+        unique_ids = np.unique(ids)
+        positions, found = self._positions(unique_ids)
+        positions = positions[found]
+        groups = np.searchsorted(self._offsets, positions, side="right") - 1
+
+        parts = []
+        for group in np.unique(groups):
+            rows = positions[groups == group] - self._offsets[group]
+            parts.append(self._row_group(int(group), columns).iloc[rows])
+        frame = pd.concat(parts, ignore_index=True) if parts else self._row_group(0, columns).iloc[:0]
+        return frame.set_index(KEY_COLUMN).reindex(pd.Index(ids, name=KEY_COLUMN))
+
+    def get(self, customer_id, columns: Optional[Sequence[str]] = None) -> pd.Series:
+        """Feature row for one customer; raises ``KeyError`` if it is not stored."""
+        if customer_id not in self:
+            raise KeyError(customer_id)
+        return self.get_many([customer_id], columns).iloc[0]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Build or query the per-customer feature store.")
+    parser.add_argument("--root", type=Path, default=FEATURE_STORE_PATH)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Rebuild from the clean dataset and segment export")
+    build.add_argument("--clean", type=Path, default=Path("data/processed/clean_dataset.csv"))
+    build.add_argument("--segmented", type=Path, default=SEGMENTED_PATH)
+    build.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE)
+    get = subparsers.add_parser("get", help="Print features for customer ids")
+    get.add_argument("customer_ids", type=int, nargs="+")
+    get.add_argument("--columns", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        clean = pd.read_csv(args.clean, parse_dates=["signup_date", "last_seen"])
+        build_feature_store(
+            clean, args.root, segments=load_segments(args.segmented), row_group_size=args.row_group_size
+        )
+        print(f"Stored features for {len(clean):,} customers in {args.root}")
+    else:
+        print(FeatureStore(args.root).get_many(args.customer_ids, args.columns).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Executive KPI summary computed once per pipeline run and shared by reporting."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Union
+
+import numpy as np
+import pandas as pd
+
+from src.utils.stats import RunningMoments, RunningProportion, group_moments
+
+
+KPI_SUMMARY_PATH = Path("reports/kpi_summary.json")
+
+HIGH_SUPPORT_THRESHOLD = 0.5
+SUPPORT_BINS = [-0.01, 0.2, 0.5, 1.5, np.inf]
+SUPPORT_LABELS = ["0-0.2", "0.2-0.5", "0.5-1.5", ">1.5"]
+
+
+def _iter_chunks(data: Union[pd.DataFrame, Iterable[pd.DataFrame]]) -> Iterable[pd.DataFrame]:
+    if isinstance(data, pd.DataFrame):
+        yield data
+    else:
+        yield from data
+
+
+class KpiAccumulator:
+    """Collect the dashboard/PDF KPIs from one or more data chunks.
+
+    Each worker can feed its own chunks and the partial accumulators are then
+    combined with :meth:`merge`, so the summary never needs the full frame.
+    """
+
+    def __init__(self) -> None:
+        self.churn = RunningProportion()
+        self.app_adoption = RunningProportion()
+        self.high_support = RunningProportion()
+        self.churn_by_app = {"with_app": RunningProportion(), "without_app": RunningProportion()}
+        self.churn_by_support = {label: RunningProportion() for label in SUPPORT_LABELS}
+        self.avg_monthly_revenue = RunningMoments()
+        self.next_month_spend = RunningMoments()
+
+    def update(self, chunk: pd.DataFrame) -> "KpiAccumulator":
+        """Fold a chunk of the clean dataset into the running KPIs."""
+        churned = chunk["churned"].astype(bool).to_numpy()
+        has_app = chunk["has_app"].astype(bool).to_numpy()
+        support = chunk["support_tickets_per_month"].to_numpy(dtype=float)
+
+        self.churn.update(churned)
+        self.app_adoption.update(has_app)
+        self.high_support.update(support >= HIGH_SUPPORT_THRESHOLD)
+        self.churn_by_app["with_app"].update(churned[has_app])
+        self.churn_by_app["without_app"].update(churned[~has_app])
+
+        bands = pd.cut(support, bins=SUPPORT_BINS, labels=SUPPORT_LABELS).codes
+        for code, label in enumerate(SUPPORT_LABELS):
+            self.churn_by_support[label].update(churned[bands == code])
+
+        self.avg_monthly_revenue.update(chunk["avg_monthly_revenue"].to_numpy(dtype=float))
+        self.next_month_spend.update(chunk["next_month_spend"].to_numpy(dtype=float))
+        return self
+
+    def merge(self, other: "KpiAccumulator") -> "KpiAccumulator":
+        """Return a new accumulator combining two partial results."""
+        combined = KpiAccumulator()
+        for name, value in vars(self).items():
+            if isinstance(value, dict):
+                setattr(
+                    combined,
+                    name,
+                    {key: acc.merge(getattr(other, name)[key]) for key, acc in value.items()},
+                )
+            else:
+                setattr(combined, name, value.merge(getattr(other, name)))
+        return combined
+
+    def summary(self) -> Dict[str, object]:
+        """Return the JSON-serialisable KPI summary (rates as fractions)."""
+
+        def proportion(acc: RunningProportion) -> Dict[str, float]:
+            low, high = acc.confidence_interval()
+            return {"value": acc.proportion, "ci_low": low, "ci_high": high, "n": acc.count}
+
+        def mean(acc: RunningMoments) -> Dict[str, float]:
+            low, high = acc.confidence_interval()
+            return {"value": acc.mean, "ci_low": float(low), "ci_high": float(high), "n": acc.count}
+
+        return {
+            "customers": self.churn.count,
+            "churn_rate": proportion(self.churn),
+            "app_adoption": proportion(self.app_adoption),
+            "high_support_share": proportion(self.high_support),
+            "avg_monthly_revenue": mean(self.avg_monthly_revenue),
+            "next_month_spend": mean(self.next_month_spend),
+            "churn_rate_by_app": {key: proportion(acc) for key, acc in self.churn_by_app.items()},
+            "churn_rate_by_support": {
+                key: proportion(acc) for key, acc in self.churn_by_support.items()
+            },
+        }
+
+
+def compute_kpi_summary(data: Union[pd.DataFrame, Iterable[pd.DataFrame]]) -> Dict[str, object]:
+    """Compute the KPI summary from a frame or an iterable of chunks."""
+    accumulator = KpiAccumulator()
+    for chunk in _iter_chunks(data):
+        accumulator.update(chunk)
+    return accumulator.summary()
+
+
+def _proportions(count: np.ndarray, mean: np.ndarray) -> list:
+    return [
+        RunningProportion(int(round(m * c)) if c else 0, int(c)) for c, m in zip(count, np.nan_to_num(mean))
+    ]
+
+
+def _moments(count: np.ndarray, mean: np.ndarray, var: np.ndarray) -> list:
+    return [
+        RunningMoments(int(c), float(m) if c else 0.0, float(v * (c - 1)) if c > 1 else 0.0)
+        for c, m, v in zip(count, mean, var)
+    ]
+
+
+def grouped_kpi_summaries(df: pd.DataFrame, by: str) -> Dict[object, Dict[str, object]]:
+    """Compute the KPI summary for every level of ``by`` in one vectorized pass.
+
+    Per-slice counts and moments come from ``np.bincount`` over combined
+    slice/sub-group codes, so the cost does not grow with the number of
+    slices. Returns ``{level: summary}`` in the shape of :func:`compute_kpi_summary`.
+    """
+    codes, levels = pd.factorize(df[by], sort=True)
+    n_slices = len(levels)
+    churned = df["churned"].astype(bool).to_numpy()
+    has_app = df["has_app"].astype(bool).to_numpy()
+    support = df["support_tickets_per_month"].to_numpy(dtype=float)
+    bands = pd.cut(support, bins=SUPPORT_BINS, labels=SUPPORT_LABELS).codes
+
+    values = np.column_stack(
+        [
+            churned,
+            has_app,
+            support >= HIGH_SUPPORT_THRESHOLD,
+            df["avg_monthly_revenue"].to_numpy(dtype=float),
+            df["next_month_spend"].to_numpy(dtype=float),
+        ]
+    ).astype(float)
+    count, mean, var = group_moments(values, codes, n_slices)
+
+    churn_col = churned[:, None].astype(float)
+    app_codes = np.where(codes >= 0, codes * 2 + has_app, -1)
+    app_count, app_mean, _ = group_moments(churn_col, app_codes, n_slices * 2)
+    n_bands = len(SUPPORT_LABELS)
+    band_codes = np.where((codes >= 0) & (bands >= 0), codes * n_bands + bands, -1)
+    band_count, band_mean, _ = group_moments(churn_col, band_codes, n_slices * n_bands)
+
+    churn = _proportions(count[:, 0], mean[:, 0])
+    app_adoption = _proportions(count[:, 1], mean[:, 1])
+    high_support = _proportions(count[:, 2], mean[:, 2])
+    revenue = _moments(count[:, 3], mean[:, 3], var[:, 3])
+    spend = _moments(count[:, 4], mean[:, 4], var[:, 4])
+    by_app = _proportions(app_count[:, 0], app_mean[:, 0])
+    by_band = _proportions(band_count[:, 0], band_mean[:, 0])
+
+    summaries = {}
+    for i, level in enumerate(levels):
+        accumulator = KpiAccumulator()
+        accumulator.churn = churn[i]
+        accumulator.app_adoption = app_adoption[i]
+        accumulator.high_support = high_support[i]
+        accumulator.avg_monthly_revenue = revenue[i]
+        accumulator.next_month_spend = spend[i]
+        accumulator.churn_by_app = {"with_app": by_app[2 * i + 1], "without_app": by_app[2 * i]}
+        accumulator.churn_by_support = {
+            label: by_band[i * n_bands + j] for j, label in enumerate(SUPPORT_LABELS)
+        }
+        summaries[level] = accumulator.summary()
+    return summaries
+
+
+def save_kpi_summary(summary: Dict[str, object], path: Path = KPI_SUMMARY_PATH) -> None:
+    """Persist the KPI summary as JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(summary, indent=2))
+
+
+def load_kpi_summary(path: Path = KPI_SUMMARY_PATH) -> Dict[str, object]:
+    """Read a previously saved KPI summary."""
+    return json.loads(Path(path).read_text())
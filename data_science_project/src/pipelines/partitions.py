@@ -0,0 +1,156 @@
+"""Month-partitioned Parquet storage of the clean dataset and trend queries over it.
+
+Customers are stored under Hive-style ``month=YYYY-MM`` directories keyed on
+``last_seen``, so a time-window query opens only the partitions in range and
+the month never has to be recomputed from timestamps::
+
+    data/processed/clean_by_month/month=2025-06/part-<snapshot>-0.parquet
+
+New snapshots are appended as extra part files (or replace the months they
+touch), so history can grow without rewriting older partitions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import uuid
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from src.reporting.aggregations import filter_customers, monthly_churn_spend
+
+
+PARTITIONED_DATA_PATH = Path("data/processed/clean_by_month")
+PARTITION_COLUMN = "month"
+PARTITIONING = ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor="hive")
+TREND_COLUMNS = ["churned", "next_month_spend"]
+FILTER_COLUMNS = {"plans": "plan_type", "provinces": "province", "support_band": "support_tickets_per_month"}
+
+
+def month_key(last_seen: pd.Series) -> pd.Series:
+    """``YYYY-MM`` partition key for each ``last_seen`` timestamp."""
+    return last_seen.dt.strftime("%Y-%m")
+
+
+def write_month_partitions(
+    df: pd.DataFrame,
+    root: Path = PARTITIONED_DATA_PATH,
+    *,
+    mode: str = "append",
+    snapshot_id: Optional[str] = None,
+) -> List[str]:
+    """Write ``df`` into monthly partitions and return the months written.
+
+    ``mode="append"`` adds new part files next to existing ones (use it for
+    snapshots that do not repeat customers already stored);
+    ``mode="replace"`` deletes and rewrites every month present in ``df``
+    while leaving other months untouched.
+    """
+    if mode not in {"append", "replace"}:
+        raise ValueError(f"Unknown write mode: {mode}")
+    months = month_key(df["last_seen"])
+    if months.isna().any():
+        raise ValueError("Rows without last_seen cannot be partitioned by month")
+    table = pa.Table.from_pandas(df.assign(**{PARTITION_COLUMN: months}), preserve_index=False)
+    snapshot_id = snapshot_id or uuid.uuid4().hex[:12]
+    root.mkdir(parents=True, exist_ok=True)
+    ds.write_dataset(
+        table,
+        root,
+        format="parquet",
+        partitioning=PARTITIONING,
+        basename_template=f"part-{snapshot_id}-{{i}}.parquet",
+        existing_data_behavior="delete_matching" if mode == "replace" else "overwrite_or_ignore",
+    )
+    return sorted(months.unique())
+
+
+def list_months(root: Path = PARTITIONED_DATA_PATH) -> List[str]:
+    """Months with at least one stored partition file, oldest first."""
+    prefix = f"{PARTITION_COLUMN}="
+    return sorted(
+        path.name[len(prefix):]
+        for path in Path(root).glob(f"{prefix}*")
+        if path.is_dir() and any(path.glob("*.parquet"))
+    )
+
+
+def read_months(
+    root: Path = PARTITIONED_DATA_PATH,
+    *,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """Read the partitions with ``start <= month <= end`` (inclusive ``YYYY-MM``).
+
+    The range is applied to the partition key, so files outside it are never
+    opened. The returned frame carries a categorical ``month`` column.
+    """
+    dataset = ds.dataset(root, format="parquet", partitioning=PARTITIONING)
+    month = ds.field(PARTITION_COLUMN)
+    expression = None
+    if start is not None:
+        expression = month >= start
+    if end is not None:
+        upper = month <= end
+        expression = upper if expression is None else expression & upper
+    if columns is not None:
+        columns = list(dict.fromkeys([*columns, PARTITION_COLUMN]))
+    frame = dataset.to_table(columns=columns, filter=expression).to_pandas()
+    # Sorted categories keep groupby output in chronological order.
+    frame[PARTITION_COLUMN] = frame[PARTITION_COLUMN].astype(str).astype("category")
+    return frame
+
+
+def monthly_trend(
+    root: Path = PARTITIONED_DATA_PATH,
+    *,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    plans: Optional[Sequence[str]] = None,
+    provinces: Optional[Sequence[str]] = None,
+    support_band: str = "All",
+) -> pd.DataFrame:
+    """Monthly churn rate and next-month spend for a month range and filter state.
+
+    Same output as :func:`src.reporting.aggregations.monthly_churn_spend`, but
+    only the partitions in range and the columns the filters need are read.
+    """
+    columns = list(TREND_COLUMNS)
+    for argument, value in (("plans", plans), ("provinces", provinces), ("support_band", support_band != "All")):
+        if value:
+            columns.append(FILTER_COLUMNS[argument])
+    frame = read_months(root, start=start, end=end, columns=columns)
+    return monthly_churn_spend(filter_customers(frame, plans, provinces, support_band))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Manage the month-partitioned clean dataset.")
+    parser.add_argument("--root", type=Path, default=PARTITIONED_DATA_PATH)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    append = subparsers.add_parser("append", help="Add a cleaned snapshot CSV to the store")
+    append.add_argument("snapshot", type=Path)
+    append.add_argument("--replace", action="store_true", help="Rewrite the months the snapshot covers")
+    trend = subparsers.add_parser("trend", help="Print the monthly churn/spend trend")
+    trend.add_argument("--start")
+    trend.add_argument("--end")
+    subparsers.add_parser("months", help="List stored months")
+    args = parser.parse_args(argv)
+
+    if args.command == "append":
+        snapshot = pd.read_csv(args.snapshot, parse_dates=["signup_date", "last_seen"])
+        months = write_month_partitions(snapshot, args.root, mode="replace" if args.replace else "append")
+        print(f"Wrote {len(snapshot):,} rows across {len(months)} months to {args.root}")
+    elif args.command == "trend":
+        print(monthly_trend(args.root, start=args.start, end=args.end).to_string(index=False))
+    else:
+        print("\n".join(list_months(args.root)))
+
+
+if __name__ == "__main__":
+    main()
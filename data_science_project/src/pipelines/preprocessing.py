@@ -3,11 +3,15 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Optional
 
 import numpy as np
 import pandas as pd
 
+from src.pipelines.kpis import KPI_SUMMARY_PATH, compute_kpi_summary, save_kpi_summary
+from src.pipelines.partitions import PARTITIONED_DATA_PATH, write_month_partitions
+from src.utils.instrumentation import instrument_stage
+
 
 RAW_DATA_PATH = Path("data/raw/training_master_dataset.csv")
 PROCESSED_DATA_PATH = Path("data/processed/clean_dataset.csv")
@@ -27,17 +31,20 @@ NUMERIC_OUTLIER_COLUMNS: Iterable[str] = (
 )
 
 
+@instrument_stage("pipeline")
 def load_raw_dataset(path: Path = RAW_DATA_PATH) -> pd.DataFrame:
     """Load the raw dataset with appropriate parsing."""
     return pd.read_csv(path, parse_dates=["signup_date", "last_seen"], dayfirst=True)
 
 
+@instrument_stage("pipeline")
 def drop_duplicate_customers(df: pd.DataFrame) -> pd.DataFrame:
     """Remove duplicate customer_id entries keeping the latest last_seen record."""
     deduped = df.sort_values("last_seen", ascending=False).drop_duplicates("customer_id")
     return deduped.sort_values("customer_id").reset_index(drop=True)
 
 
+@instrument_stage("pipeline")
 def impute_missing(df: pd.DataFrame) -> pd.DataFrame:
     """Handle missing values with segment-aware imputations."""
     filled = df.copy()
@@ -66,6 +73,7 @@ def impute_missing(df: pd.DataFrame) -> pd.DataFrame:
     return filled
 
 
+@instrument_stage("pipeline")
 def enforce_consistency(df: pd.DataFrame) -> pd.DataFrame:
     """Apply logical data integrity checks and corrections."""
     consistent = df.copy()
@@ -88,6 +96,7 @@ def enforce_consistency(df: pd.DataFrame) -> pd.DataFrame:
     return consistent
 
 
+@instrument_stage("pipeline")
 def cap_outliers(df: pd.DataFrame, columns: Iterable[str] = NUMERIC_OUTLIER_COLUMNS) -> pd.DataFrame:
     """Winsorize specified numeric columns using IQR fences."""
     capped = df.copy()
@@ -107,6 +116,7 @@ def cap_outliers(df: pd.DataFrame, columns: Iterable[str] = NUMERIC_OUTLIER_COLU
     return capped
 
 
+@instrument_stage("pipeline")
 def cast_dtypes(df: pd.DataFrame) -> pd.DataFrame:
     """Ensure appropriate datatypes for downstream modeling."""
     casted = df.copy()
@@ -151,6 +161,7 @@ def cast_dtypes(df: pd.DataFrame) -> pd.DataFrame:
     return casted
 
 
+@instrument_stage("pipeline")
 def derive_features(df: pd.DataFrame) -> pd.DataFrame:
     """Create value-add analytics features."""
     enriched = df.copy()
@@ -184,11 +195,23 @@ def derive_features(df: pd.DataFrame) -> pd.DataFrame:
     return enriched
 
 
+@instrument_stage("pipeline", profile=False)
 def run_pipeline(
     raw_path: Path = RAW_DATA_PATH,
     output_path: Path = PROCESSED_DATA_PATH,
+    kpi_path: Path = KPI_SUMMARY_PATH,
+    partition_root: Optional[Path] = PARTITIONED_DATA_PATH,
 ) -> pd.DataFrame:
-    """Execute the full preprocessing pipeline and persist the cleaned dataset."""
+    """Execute the full preprocessing pipeline and persist the cleaned dataset.
+
+    The executive KPI summary is computed once here and written to
+    ``kpi_path`` so the dashboard and PDF builder do not recompute it. Unless
+    ``partition_root`` is ``None``, the months in this run are also rewritten
+    in the month-partitioned store used by trend queries. The per-customer
+    feature store is a separate step (``python -m src pipeline
+    --feature-store`` or ``python -m src.pipelines.feature_store build``),
+    since it joins the notebook segment export.
+    """
     df = load_raw_dataset(raw_path)
     df = drop_duplicate_customers(df)
     df = impute_missing(df)
@@ -198,6 +221,9 @@ def run_pipeline(
     df = derive_features(df)
 
     df.to_csv(output_path, index=False)
+    save_kpi_summary(compute_kpi_summary(df), kpi_path)
+    if partition_root is not None:
+        write_month_partitions(df, partition_root, mode="replace")
     return df
 
 
@@ -0,0 +1,162 @@
+"""Pure aggregation helpers behind the dashboard and reporting charts."""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+SUPPORT_BAND_OPTIONS = [
+    "All",
+    "Low (<=0.2 tickets/mo)",
+    "Moderate (0.2-0.5 tickets/mo)",
+    "High (>=0.5 tickets/mo)",
+]
+SUPPORT_SEGMENT_LABELS = ["0-0.2", "0.2-0.5", "0.5-1.5", ">1.5"]
+
+
+def filter_customers(
+    clean: pd.DataFrame,
+    plans: Optional[Sequence[str]] = None,
+    provinces: Optional[Sequence[str]] = None,
+    support_band: str = "All",
+) -> pd.DataFrame:
+    """Apply the dashboard sidebar filters to the clean dataset."""
+    filtered = clean
+    if plans:
+        filtered = filtered[filtered["plan_type"].isin(plans)]
+    if provinces:
+        filtered = filtered[filtered["province"].isin(provinces)]
+    if support_band != "All":
+        support = filtered["support_tickets_per_month"]
+        if support_band.startswith("Low"):
+            filtered = filtered[support <= 0.2]
+        elif support_band.startswith("Moderate"):
+            filtered = filtered[(support > 0.2) & (support < 0.5)]
+        else:
+            filtered = filtered[support >= 0.5]
+    return filtered
+
+
+def monthly_churn_spend(filtered: pd.DataFrame) -> pd.DataFrame:
+    """Churn rate and mean next-month spend per ``last_seen`` month.
+
+    Frames read from the month-partitioned store already carry a ``month``
+    (``YYYY-MM``) column, which is used instead of re-deriving it.
+    """
+    month = filtered["month"] if "month" in filtered else filtered["last_seen"].dt.to_period("M")
+    metrics = (
+        filtered.assign(month=month)
+        .groupby("month", observed=True)
+        .agg(churn_rate=("churned", "mean"), next_spend=("next_month_spend", "mean"))
+        .reset_index()
+    )
+    metrics["month"] = pd.PeriodIndex(metrics["month"].astype(str), freq="M").to_timestamp()
+    return metrics
+
+
+def churn_rate_by(filtered: pd.DataFrame, column: str) -> pd.Series:
+    """Churn rate per level of ``column``."""
+    return filtered.groupby(column, observed=True)["churned"].mean()
+
+
+def support_band_churn(filtered: pd.DataFrame) -> pd.Series:
+    """Churn rate (%) per support-ticket band; empty when no data is available."""
+    max_support = filtered["support_tickets_per_month"].max()
+    if filtered.empty or pd.isna(max_support):
+        return pd.Series(dtype=float)
+    upper_bound = max(1.51, float(max_support) + 0.01)
+    support_bins = pd.cut(
+        filtered["support_tickets_per_month"],
+        bins=[-0.01, 0.2, 0.5, 1.5, upper_bound],
+        labels=SUPPORT_SEGMENT_LABELS,
+    )
+    return (
+        filtered.assign(support_segment=support_bins)
+        .groupby("support_segment", observed=False)["churned"]
+        .mean()
+        .mul(100)
+        .reindex(SUPPORT_SEGMENT_LABELS)
+        .dropna()
+    )
+
+
+def province_summary(filtered: pd.DataFrame) -> pd.DataFrame:
+    """Customer counts, churn rate and centroid per province."""
+    summary = (
+        filtered.groupby("province", observed=True)
+        .agg(
+            customers=("customer_id", "count"),
+            churn_rate=("churned", "mean"),
+            lat=("lat", "mean"),
+            lng=("lng", "mean"),
+        )
+        .dropna(subset=["lat", "lng"])
+        .reset_index()
+    )
+    summary["churn_rate_pct"] = summary["churn_rate"] * 100
+    return summary
+
+
+def geo_cube(clean: pd.DataFrame) -> pd.DataFrame:
+    """Precompute province totals for every plan and support filter band.
+
+    The dashboard filters only select whole (plan, province, band) cells, so
+    any filtered province summary is a sum over rows of this small table; see
+    :func:`province_summary_from_cube`.
+    """
+    support = clean["support_tickets_per_month"].to_numpy(dtype=float)
+    band = np.select([support <= 0.2, support < 0.5, support >= 0.5], ["Low", "Moderate", "High"], "")
+    lat = clean["lat"].to_numpy(dtype=float)
+    lng = clean["lng"].to_numpy(dtype=float)
+    return (
+        pd.DataFrame(
+            {
+                "plan_type": clean["plan_type"],
+                "province": clean["province"],
+                "support_band": band,
+                "customers": 1,
+                "churned": clean["churned"].astype(float).to_numpy(),
+                "lat_sum": np.nan_to_num(lat),
+                "lat_n": np.isfinite(lat).astype(int),
+                "lng_sum": np.nan_to_num(lng),
+                "lng_n": np.isfinite(lng).astype(int),
+            }
+        )
+        .groupby(["plan_type", "province", "support_band"], observed=True, dropna=False)
+        .sum()
+        .reset_index()
+    )
+
+
+def province_summary_from_cube(
+    cube: pd.DataFrame,
+    plans: Optional[Sequence[str]] = None,
+    provinces: Optional[Sequence[str]] = None,
+    support_band: str = "All",
+) -> pd.DataFrame:
+    """:func:`province_summary` of the filtered customers, answered from :func:`geo_cube`."""
+    mask = np.ones(len(cube), dtype=bool)
+    if plans:
+        mask &= cube["plan_type"].isin(plans).to_numpy()
+    if provinces:
+        mask &= cube["province"].isin(provinces).to_numpy()
+    if support_band != "All":
+        mask &= (cube["support_band"] == support_band.split()[0]).to_numpy()
+    totals = cube[mask].groupby("province", observed=True)[
+        ["customers", "churned", "lat_sum", "lat_n", "lng_sum", "lng_n"]
+    ].sum()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        summary = pd.DataFrame(
+            {
+                "customers": totals["customers"],
+                "churn_rate": totals["churned"] / totals["customers"],
+                "lat": totals["lat_sum"] / totals["lat_n"].replace(0, np.nan),
+                "lng": totals["lng_sum"] / totals["lng_n"].replace(0, np.nan),
+            }
+        )
+    summary = summary.dropna(subset=["lat", "lng"]).reset_index()
+    summary["churn_rate_pct"] = summary["churn_rate"] * 100
+    return summary
@@ -0,0 +1,201 @@
+"""Chart-data layer that keeps Plotly payloads within a size budget.
+
+Dashboard charts are built from small aggregate tables rather than raw rows:
+scatter plots switch from per-point WebGL markers to a binned 2D density once
+they exceed :data:`SCATTER_POINT_LIMIT` points, and the geo chart is answered
+from the precomputed province cube in :mod:`src.reporting.aggregations`.
+:func:`payload_bytes` measures the JSON a figure ships to the browser so each
+chart can be checked against a budget; :func:`check_payload` does so only
+when tracing or an explicit check is on.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from src.utils.instrumentation import emit, tracing_enabled
+from src.utils.stats import group_moments
+
+
+SCATTER_POINT_LIMIT = 5_000
+DENSITY_BINS = 60
+PAYLOAD_BUDGET_BYTES = 1_000_000
+MARKER_SIZE_RANGE = (4.0, 18.0)
+
+
+def _edges(values: np.ndarray, bins: int) -> np.ndarray:
+    low, high = float(values.min()), float(values.max())
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    return np.linspace(low, high, bins + 1)
+
+
+def density_bins(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    *,
+    by: Optional[str] = None,
+    mean_columns: Sequence[str] = (),
+    bins: int = DENSITY_BINS,
+) -> pd.DataFrame:
+    """Aggregate points onto a ``bins x bins`` grid, optionally per level of ``by``.
+
+    Returns one row per occupied cell with the cell centre, point ``count`` and
+    the mean of every column in ``mean_columns``. Rows with a missing
+    coordinate are dropped.
+    """
+    xs = df[x].to_numpy(dtype=float)
+    ys = df[y].to_numpy(dtype=float)
+    valid = np.isfinite(xs) & np.isfinite(ys)
+    columns = [by] if by else []
+    if not valid.any():
+        return pd.DataFrame(columns=columns + [x, y, "count", *mean_columns])
+
+    x_edges, y_edges = _edges(xs[valid], bins), _edges(ys[valid], bins)
+    ix = np.clip(np.searchsorted(x_edges, xs, side="right") - 1, 0, bins - 1)
+    iy = np.clip(np.searchsorted(y_edges, ys, side="right") - 1, 0, bins - 1)
+    cells = bins * bins
+    if by:
+        level_codes, levels = pd.factorize(df[by], sort=True)
+    else:
+        level_codes, levels = np.zeros(len(df), dtype=int), pd.Index([None])
+    codes = np.where(valid & (level_codes >= 0), level_codes * cells + ix * bins + iy, -1)
+
+    values = np.column_stack(
+        [np.ones(len(df))] + [df[column].to_numpy(dtype=float) for column in mean_columns]
+    )
+    count, mean, _ = group_moments(values, codes, len(levels) * cells)
+    occupied = np.flatnonzero(count[:, 0])
+    level_idx, cell_idx = np.divmod(occupied, cells)
+    x_centres = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centres = (y_edges[:-1] + y_edges[1:]) / 2
+
+    result = pd.DataFrame(
+        {
+            x: x_centres[cell_idx // bins],
+            y: y_centres[cell_idx % bins],
+            "count": count[occupied, 0].astype(int),
+        }
+    )
+    for j, column in enumerate(mean_columns, start=1):
+        result[column] = mean[occupied, j]
+    if by:
+        result.insert(0, by, np.asarray(levels)[level_idx])
+    return result
+
+
+def _marker_sizes(counts: np.ndarray, max_count: int) -> np.ndarray:
+    low, high = MARKER_SIZE_RANGE
+    return low + (high - low) * np.sqrt(counts / max(max_count, 1))
+
+
+def scatter_figure(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    *,
+    color: str,
+    hover: Sequence[str] = (),
+    mean_columns: Sequence[str] = (),
+    labels: Optional[Dict[str, str]] = None,
+    limit: int = SCATTER_POINT_LIMIT,
+    bins: int = DENSITY_BINS,
+) -> go.Figure:
+    """Scatter ``x``/``y`` coloured by ``color`` with a bounded payload.
+
+    Up to ``limit`` points are drawn individually as ``scattergl`` markers
+    with every ``hover`` column. Larger frames are binned with
+    :func:`density_bins`; each occupied cell is one marker sized by its point
+    count, and only ``mean_columns`` are shown, as cell means. Identifiers
+    such as ``customer_id`` belong in ``hover`` only.
+    """
+    labels = labels or {}
+    palette = px.colors.qualitative.Plotly
+    levels = sorted(df[color].dropna().unique())
+    binned = len(df) > limit
+    mean_columns = list(mean_columns)
+    if binned:
+        data = density_bins(df, x, y, by=color, mean_columns=mean_columns, bins=bins)
+        max_count = int(data["count"].max()) if len(data) else 1
+
+    fig = go.Figure()
+    for i, level in enumerate(levels):
+        if binned:
+            subset = data[data[color] == level]
+            hover_columns = ["count", *mean_columns]
+            marker = dict(
+                color=palette[i % len(palette)],
+                size=_marker_sizes(subset["count"].to_numpy(), max_count).astype(np.float32),
+                opacity=0.7,
+            )
+        else:
+            subset = df[df[color] == level]
+            hover_columns = list(hover)
+            marker = dict(color=palette[i % len(palette)], size=6, opacity=0.7)
+        template = "<br>".join(
+            [f"{labels.get(x, x)}=%{{x:.2f}}", f"{labels.get(y, y)}=%{{y:.2f}}"]
+            + [f"{labels.get(column, column)}=%{{customdata[{j}]}}" for j, column in enumerate(hover_columns)]
+        )
+        # float32 halves the base64-encoded arrays Plotly ships for the binned
+        # aggregates; point hover data stays object so ids are not cast to float.
+        dtype = np.float32 if binned else None
+        hover_dtype = np.float32 if binned else object
+        fig.add_trace(
+            go.Scattergl(
+                x=subset[x].to_numpy(dtype=dtype),
+                y=subset[y].to_numpy(dtype=dtype),
+                mode="markers",
+                name=str(level),
+                marker=marker,
+                customdata=subset[hover_columns].round(2).to_numpy(dtype=hover_dtype) if hover_columns else None,
+                hovertemplate=template + "<extra>%{fullData.name}</extra>",
+            )
+        )
+
+    title = labels.get(color, color)
+    if binned:
+        title = f"{title} (binned: {len(df):,} points)"
+    fig.update_layout(
+        legend_title_text=title,
+        xaxis_title=labels.get(x, x),
+        yaxis_title=labels.get(y, y),
+    )
+    return fig
+
+
+def payload_bytes(fig: go.Figure) -> int:
+    """Size of the JSON a figure sends to the browser."""
+    return len(fig.to_json().encode("utf-8"))
+
+
+def check_payload(
+    name: str, fig: go.Figure, budget: int = PAYLOAD_BUDGET_BYTES, *, force: bool = False
+) -> Optional[int]:
+    """Measure a chart's payload when tracing is on (or ``force`` is set).
+
+    Measuring serializes the whole figure a second time, so by default it is
+    skipped and ``None`` is returned. With tracing on, a trace record is
+    emitted for every measured chart.
+    """
+    tracing = tracing_enabled()
+    if not (tracing or force):
+        return None
+    size = payload_bytes(fig)
+    if tracing:
+        emit(
+            {
+                "component": "dashboard",
+                "stage": "chart_payload",
+                "chart": name,
+                "payload_bytes": size,
+                "budget_bytes": budget,
+                "over_budget": size > budget,
+            }
+        )
+    return size
@@ -0,0 +1,203 @@
+"""Per-province and per-segment insight reports from a single grouped scan.
+
+Rather than rerunning the global report once per slice, every slice aggregate
+(KPIs, churn by plan/app/support, monthly trend, provincial footprint and the
+charges histogram) is computed in one vectorized pass per slicing dimension
+using ``np.bincount`` over combined slice/sub-group codes. Each slice's figures
+and PDF are then rendered from those aggregates on a process pool.
+
+    python -m src.reporting.fanout --dimensions province retention_segment
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.pipelines.kpis import SUPPORT_BINS, SUPPORT_LABELS, grouped_kpi_summaries
+from src.reporting.figures import FIGURE_COLUMNS, HISTOGRAM_BINS, figure_tasks, render_figures
+from src.reporting.insight_pdf import CLEAN_PATH, PROJECT_ROOT, SEGMENTED_PATH, ReportJob, write_pdfs
+from src.utils.stats import group_moments
+
+
+SLICE_DIMENSIONS = ("province", "retention_segment")
+SLICES_DIR = PROJECT_ROOT / "reports" / "slices"
+KPI_COLUMNS = ["avg_monthly_revenue"]
+
+
+def load_slice_frame(clean_path: Path = CLEAN_PATH, segmented_path: Path = SEGMENTED_PATH) -> pd.DataFrame:
+    """Read only the columns the slice reports need, with retention segments attached."""
+    clean = pd.read_csv(clean_path, usecols=FIGURE_COLUMNS + KPI_COLUMNS, parse_dates=["last_seen"])
+    segments = pd.read_csv(segmented_path, usecols=["customer_id", "retention_segment"])
+    clean["retention_segment"] = clean["customer_id"].map(
+        segments.set_index("customer_id")["retention_segment"]
+    )
+    return clean
+
+
+def _slug(value: object) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", str(value).lower()).strip("-")
+
+
+def _combined(codes: np.ndarray, sub_codes: np.ndarray, n_sub: int) -> np.ndarray:
+    return np.where((codes >= 0) & (sub_codes >= 0), codes * n_sub + sub_codes, -1)
+
+
+def slice_figure_aggregates(df: pd.DataFrame, by: str) -> Dict[object, Dict[str, pd.DataFrame]]:
+    """Compute every slice's figure tables for dimension ``by`` in one pass.
+
+    Returns ``{level: aggregates}`` where ``aggregates`` has the same keys and
+    shapes as :func:`src.reporting.figures.figure_aggregates`.
+    """
+    codes, levels = pd.factorize(df[by], sort=True)
+    n = len(levels)
+    churned = df["churned"].astype(bool).to_numpy().astype(float)
+
+    def churn_by(sub_codes: np.ndarray, n_sub: int, extra: Optional[np.ndarray] = None):
+        values = churned[:, None] if extra is None else np.column_stack([churned, extra])
+        count, mean, _ = group_moments(values, _combined(codes, sub_codes, n_sub), n * n_sub)
+        return count.reshape(n, n_sub, -1), mean.reshape(n, n_sub, -1)
+
+    plan_codes, plans = pd.factorize(df["plan_type"], sort=True)
+    plan_count, plan_mean = churn_by(plan_codes, len(plans))
+
+    app_codes = df["has_app"].astype(bool).to_numpy().astype(int)
+    app_count, app_mean = churn_by(app_codes, 2)
+
+    support = df["support_tickets_per_month"].to_numpy(dtype=float)
+    band_codes = pd.cut(support, bins=SUPPORT_BINS, labels=SUPPORT_LABELS).codes.astype(int)
+    band_count, band_mean = churn_by(band_codes, len(SUPPORT_LABELS))
+
+    month_codes, months = pd.factorize(df["last_seen"].dt.to_period("M"), sort=True)
+    spend = df["next_month_spend"].to_numpy(dtype=float)
+    trend_count, trend_mean = churn_by(month_codes, len(months), spend)
+    month_starts = pd.PeriodIndex(months).to_timestamp()
+
+    province_codes, provinces = pd.factorize(df["province"], sort=True)
+    geo_count, geo_mean = churn_by(
+        province_codes, len(provinces), df[["lat", "lng"]].to_numpy(dtype=float)
+    )
+
+    charges = df["monthly_charges"].to_numpy(dtype=float)
+    edges = np.histogram_bin_edges(charges[~np.isnan(charges)], bins=HISTOGRAM_BINS)
+    bins = np.clip(np.searchsorted(edges, charges, side="right") - 1, 0, HISTOGRAM_BINS - 1)
+    bins = np.where(np.isnan(charges), -1, bins)
+    hist_codes = _combined(codes, bins, HISTOGRAM_BINS)
+    hist = np.bincount(hist_codes[hist_codes >= 0], minlength=n * HISTOGRAM_BINS).reshape(
+        n, HISTOGRAM_BINS
+    )
+
+    aggregates: Dict[object, Dict[str, pd.DataFrame]] = {}
+    for i, level in enumerate(levels):
+        seen = plan_count[i, :, 0] > 0
+        plan = pd.Series(plan_mean[i, seen, 0] * 100, index=plans[seen], name="value")
+        app_seen = app_count[i, :, 0] > 0
+        app = pd.Series(
+            app_mean[i, app_seen, 0] * 100, index=np.array(["No App", "Has App"])[app_seen], name="value"
+        )
+        band_seen = band_count[i, :, 0] > 0
+        bands = pd.Series(
+            band_mean[i, band_seen, 0] * 100, index=np.array(SUPPORT_LABELS)[band_seen], name="value"
+        )
+        month_seen = trend_count[i, :, 0] > 0
+        trend = pd.DataFrame(
+            {
+                "month": month_starts[month_seen],
+                "churn_rate": trend_mean[i, month_seen, 0],
+                "next_spend": trend_mean[i, month_seen, 1],
+            }
+        )
+        geo_seen = geo_count[i, :, 0] > 0
+        geo = pd.DataFrame(
+            {
+                "province": provinces[geo_seen],
+                "customers": geo_count[i, geo_seen, 0].astype(int),
+                "churn_rate": geo_mean[i, geo_seen, 0],
+                "lat": geo_mean[i, geo_seen, 1],
+                "lng": geo_mean[i, geo_seen, 2],
+            }
+        )
+        geo["churn_rate_pct"] = geo["churn_rate"] * 100
+        aggregates[level] = {
+            "plan": plan.sort_values(ascending=False).to_frame(),
+            "app": app.to_frame(),
+            "support": bands.to_frame(),
+            "trend": trend,
+            "geo": geo if len(geo) > 1 else geo.iloc[0:0],
+            "histogram": pd.DataFrame({"left": edges[:-1], "right": edges[1:], "count": hist[i]}),
+        }
+    return aggregates
+
+
+def kpi_table(summaries: Dict[str, Dict[object, Dict[str, object]]]) -> pd.DataFrame:
+    """Flatten per-slice KPI summaries into one row per (dimension, slice)."""
+    rows = []
+    for dimension, by_level in summaries.items():
+        for level, kpis in by_level.items():
+            rows.append(
+                {
+                    "dimension": dimension,
+                    "slice": level,
+                    "customers": kpis["customers"],
+                    "churn_rate_pct": kpis["churn_rate"]["value"] * 100,
+                    "app_adoption_pct": kpis["app_adoption"]["value"] * 100,
+                    "high_support_pct": kpis["high_support_share"]["value"] * 100,
+                    "avg_monthly_revenue": kpis["avg_monthly_revenue"]["value"],
+                    "next_month_spend": kpis["next_month_spend"]["value"],
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def build_slice_reports(
+    dimensions: Sequence[str] = SLICE_DIMENSIONS,
+    *,
+    df: Optional[pd.DataFrame] = None,
+    output_dir: Path = SLICES_DIR,
+    max_workers: Optional[int] = None,
+) -> List[Path]:
+    """Write a KPI table plus one insight PDF per slice of every dimension."""
+    if df is None:
+        df = load_slice_frame()
+
+    tasks, jobs = [], []
+    summaries: Dict[str, Dict[object, Dict[str, object]]] = {}
+    for dimension in dimensions:
+        summaries[dimension] = grouped_kpi_summaries(df, dimension)
+        for level, aggregates in slice_figure_aggregates(df, dimension).items():
+            slice_dir = output_dir / dimension / _slug(level)
+            label = f"{dimension.replace('_', ' ').title()}: {level}"
+            slice_tasks = figure_tasks(aggregates, slice_dir / "figures", label=str(level))
+            tasks.extend(slice_tasks)
+            jobs.append(
+                ReportJob(
+                    pdf_path=slice_dir / "insight_summary.pdf",
+                    kpis=summaries[dimension][level],
+                    figures=[(task.caption, task.path) for task in slice_tasks],
+                    scope=label,
+                    narrative=False,
+                )
+            )
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    kpi_table(summaries).to_csv(output_dir / "kpi_table.csv", index=False)
+    render_figures(tasks, max_workers=max_workers)
+    return write_pdfs(jobs, max_workers=max_workers)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Build per-slice insight reports.")
+    parser.add_argument("--dimensions", nargs="+", default=list(SLICE_DIMENSIONS))
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size for rendering")
+    args = parser.parse_args(argv)
+    paths = build_slice_reports(args.dimensions, max_workers=args.workers)
+    print(f"Wrote {len(paths)} slice reports to {SLICES_DIR}")
+
+
+if __name__ == "__main__":
+    main()
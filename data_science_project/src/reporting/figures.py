@@ -0,0 +1,243 @@
+"""Static report figures rendered in parallel from pre-aggregated data.
+
+Figures are described by :class:`FigureTask` objects that carry only the small
+aggregate table each chart needs, so tasks are cheap to ship to worker
+processes (matplotlib is not thread-safe) and cheap to hash. A JSON manifest
+next to the images records the input hash of every rendered figure; tasks
+whose hash is unchanged and whose image still exists are skipped. A second
+manifest can tie a figure set to its source file (size and modification
+time), so callers can skip reading and aggregating an unchanged source.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.reporting.aggregations import (
+    churn_rate_by,
+    monthly_churn_spend,
+    province_summary,
+    support_band_churn,
+)
+
+
+# Bump when renderer styling changes so cached images are regenerated.
+RENDERER_VERSION = "1"
+MANIFEST_NAME = ".figure_hashes.json"
+SOURCE_MANIFEST_NAME = ".figure_source.json"
+# Columns of the clean dataset the report figures aggregate over.
+FIGURE_COLUMNS = [
+    "customer_id",
+    "plan_type",
+    "province",
+    "lat",
+    "lng",
+    "has_app",
+    "churned",
+    "last_seen",
+    "monthly_charges",
+    "next_month_spend",
+    "support_tickets_per_month",
+]
+
+
+HISTOGRAM_BINS = 40
+
+# key -> (kind, file name, title, caption, options); keys match figure_aggregates().
+FIGURE_SPECS = {
+    "plan": ("bar", "bar_churn_by_plan.png", "Churn by Plan Tier", "Churn by Plan Tier",
+             {"ylabel": "Churn rate (%)"}),
+    "app": ("bar", "bar_churn_by_app.png", "Churn by App Adoption", "Churn Reduction from App Adoption",
+            {"ylabel": "Churn rate (%)"}),
+    "support": ("bar", "bar_churn_by_support.png", "Churn by Support Load", "Support Load vs Churn",
+                {"ylabel": "Churn rate (%)"}),
+    "trend": ("trend", "temporal_churn_spend.png", "Monthly Churn & Spend Trend", "Monthly Churn & Spend Trend", {}),
+    "geo": ("geo", "spatial_province_bubble.png", "Provincial Churn Hotspots", "Provincial Churn Hotspots", {}),
+    "histogram": ("histogram", "distribution_monthly_charges.png", "Monthly Charges Distribution",
+                  "Monthly Charges Distribution", {"xlabel": "Monthly charges (USD)"}),
+}
+
+
+@dataclass
+class FigureTask:
+    """One chart to render: its kind, aggregate data and output path."""
+
+    kind: str
+    path: Path
+    data: pd.DataFrame
+    title: str = ""
+    options: Dict[str, str] = field(default_factory=dict)
+    caption: str = ""
+
+    def input_hash(self) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{RENDERER_VERSION}|{self.kind}|{self.title}|{sorted(self.options.items())}".encode())
+        digest.update(",".join(map(str, self.data.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(self.data, index=True).to_numpy().tobytes())
+        return digest.hexdigest()
+
+
+def figure_aggregates(clean: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """Reduce the clean dataset to the small tables each report figure plots."""
+    plan = churn_rate_by(clean, "plan_type").sort_values(ascending=False) * 100
+    app = churn_rate_by(clean, "has_app").rename({True: "Has App", False: "No App"}) * 100
+    counts, edges = np.histogram(clean["monthly_charges"].dropna(), bins=HISTOGRAM_BINS)
+    return {
+        "plan": plan.rename("value").to_frame(),
+        "app": app.rename("value").to_frame(),
+        "support": support_band_churn(clean).rename("value").to_frame(),
+        "trend": monthly_churn_spend(clean),
+        "geo": province_summary(clean),
+        "histogram": pd.DataFrame({"left": edges[:-1], "right": edges[1:], "count": counts}),
+    }
+
+
+def figure_tasks(
+    aggregates: Dict[str, pd.DataFrame], figure_dir: Path, *, prefix: str = "", label: str = ""
+) -> List[FigureTask]:
+    """Turn aggregate tables into render tasks, skipping empty ones."""
+    suffix = f" ({label})" if label else ""
+    tasks = []
+    for key, (kind, file_name, title, caption, options) in FIGURE_SPECS.items():
+        data = aggregates.get(key)
+        if data is None or data.empty:
+            continue
+        tasks.append(
+            FigureTask(kind, figure_dir / f"{prefix}{file_name}", data, f"{title}{suffix}", dict(options), caption)
+        )
+    return tasks
+
+
+def report_figure_tasks(clean: pd.DataFrame, figure_dir: Path, *, prefix: str = "", label: str = "") -> List[FigureTask]:
+    """Aggregate the clean dataset into the insight-report figure tasks."""
+    return figure_tasks(figure_aggregates(clean), figure_dir, prefix=prefix, label=label)
+
+
+def render_task(task: FigureTask) -> Path:
+    """Render one figure to disk; runs inside a worker process."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from PIL import Image
+
+    fig, ax = plt.subplots(figsize=(8, 4.5))
+    data = task.data
+    if task.kind == "bar":
+        ax.bar(data.index.astype(str), data["value"], color="#0d6efd")
+        ax.set_ylabel(task.options.get("ylabel", ""))
+    elif task.kind == "histogram":
+        ax.bar(data["left"], data["count"], width=data["right"] - data["left"], align="edge", color="#6f42c1")
+        ax.set_xlabel(task.options.get("xlabel", ""))
+        ax.set_ylabel("Customers")
+    elif task.kind == "trend":
+        ax.bar(data["month"], data["churn_rate"] * 100, width=20, color="#d63384", alpha=0.6)
+        ax.set_ylabel("Churn rate (%)")
+        spend_ax = ax.twinx()
+        spend_ax.plot(data["month"], data["next_spend"], color="#0d6efd", linewidth=2.5)
+        spend_ax.set_ylabel("Next month spend (USD)")
+    elif task.kind == "geo":
+        points = ax.scatter(
+            data["lng"], data["lat"], s=data["customers"] / max(data["customers"].max(), 1) * 1500,
+            c=data["churn_rate_pct"], cmap="viridis", alpha=0.8,
+        )
+        for _, row in data.iterrows():
+            ax.annotate(str(row["province"]), (row["lng"], row["lat"]), fontsize=7, ha="center")
+        fig.colorbar(points, ax=ax, label="Churn rate (%)")
+        ax.set_xlabel("Longitude")
+        ax.set_ylabel("Latitude")
+    else:
+        plt.close(fig)
+        raise ValueError(f"Unknown figure kind: {task.kind}")
+
+    ax.set_title(task.title)
+    fig.tight_layout()
+    task.path.parent.mkdir(parents=True, exist_ok=True)
+    # Flatten to RGB: fpdf splits alpha channels row by row in pure Python,
+    # which dominated PDF assembly time for RGBA images.
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=120, facecolor="white")
+    plt.close(fig)
+    buffer.seek(0)
+    Image.open(buffer).convert("RGB").save(task.path, format="PNG")
+    return task.path
+
+
+def _load_manifest(path: Path) -> Dict[str, str]:
+    if path.exists():
+        return json.loads(path.read_text())
+    return {}
+
+
+def render_figures(tasks: Sequence[FigureTask], *, max_workers: Optional[int] = None) -> List[Path]:
+    """Render every stale task on a process pool and return all figure paths.
+
+    Tasks are grouped by output directory so each directory keeps its own
+    hash manifest.
+    """
+    manifests: Dict[Path, Dict[str, str]] = {}
+    stale: List[FigureTask] = []
+    hashes: Dict[Path, str] = {}
+    for task in tasks:
+        manifest_path = task.path.parent / MANIFEST_NAME
+        manifest = manifests.setdefault(manifest_path, _load_manifest(manifest_path))
+        digest = task.input_hash()
+        hashes[task.path] = digest
+        if manifest.get(task.path.name) != digest or not task.path.exists():
+            stale.append(task)
+
+    if len(stale) == 1 or max_workers == 1:
+        rendered = [render_task(task) for task in stale]
+    elif stale:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            rendered = list(pool.map(render_task, stale))
+    else:
+        rendered = []
+
+    for path in rendered:
+        manifests[path.parent / MANIFEST_NAME][path.name] = hashes[path]
+    for manifest_path, manifest in manifests.items():
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    return [task.path for task in tasks]
+
+
+def source_fingerprint(path: Path) -> str:
+    """Identify a source file by renderer version, size and modification time."""
+    stat = Path(path).stat()
+    return f"{RENDERER_VERSION}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+def cached_figures(figure_dir: Path, fingerprint: str) -> Optional[List[Tuple[str, Path]]]:
+    """``(caption, path)`` of figures last rendered from ``fingerprint``'s source.
+
+    Returns ``None`` when the source changed or any image is missing, in which
+    case the figures have to be aggregated and rendered again.
+    """
+    manifest_path = Path(figure_dir) / SOURCE_MANIFEST_NAME
+    if not manifest_path.exists():
+        return None
+    manifest = json.loads(manifest_path.read_text())
+    if manifest.get("source") != fingerprint:
+        return None
+    figures = [(caption, Path(figure_dir) / name) for caption, name in manifest["figures"]]
+    if not all(path.exists() for _, path in figures):
+        return None
+    return figures
+
+
+def record_figure_source(figure_dir: Path, fingerprint: str, tasks: Sequence[FigureTask]) -> None:
+    """Remember which figures were rendered from the source with ``fingerprint``."""
+    manifest_path = Path(figure_dir) / SOURCE_MANIFEST_NAME
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    figures = [[task.caption, task.path.name] for task in tasks]
+    manifest_path.write_text(json.dumps({"source": fingerprint, "figures": figures}, indent=2))
@@ -0,0 +1,234 @@
+"""Insight summary PDF builder.
+
+Replaces the former top-level ``_build_insight_pdf.py`` script. KPIs come from
+the pipeline's ``reports/kpi_summary.json``; figures are rendered from
+aggregates on a process pool and skipped when their inputs are unchanged; PDFs
+for several reports (e.g. per province or segment) are written in parallel.
+Figures go to ``reports/figures/pdf/``, apart from the notebook PNGs in
+``reports/figures/``, and the clean CSV is not read again while it is
+unchanged since the last build.
+
+    python -m src.reporting.insight_pdf
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from src.pipelines.kpis import compute_kpi_summary, load_kpi_summary
+from src.reporting.figures import (
+    FIGURE_COLUMNS,
+    cached_figures,
+    record_figure_source,
+    render_figures,
+    report_figure_tasks,
+    source_fingerprint,
+)
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+CLEAN_PATH = PROJECT_ROOT / "data" / "processed" / "clean_dataset.csv"
+SEGMENTED_PATH = PROJECT_ROOT / "data" / "processed" / "segmented.csv"
+SEGMENT_SUMMARY_PATH = PROJECT_ROOT / "reports" / "segment_summary.csv"
+KPI_SUMMARY_PATH = PROJECT_ROOT / "reports" / "kpi_summary.json"
+# Own directory: reports/figures/ holds the notebook PNGs under the same names.
+FIGURE_DIR = PROJECT_ROOT / "reports" / "figures" / "pdf"
+PDF_PATH = PROJECT_ROOT / "reports" / "insight_summary.pdf"
+
+RECOMMENDATIONS = [
+    'Launch the 4-week concierge retention pilot targeting 5,557 high-risk accounts with segment-specific treatments.',
+    'Bundle loyalty perks for Premium Data Power Users to protect $70+ monthly spend while deepening digital engagement.',
+    'Scale mobile app adoption incentives for the 22% of the base still offline, tied to data/top-up rewards.',
+    'Automate support ticket velocity alerts to intervene before churn spikes.',
+    'Embed the interactive dashboard into weekly revenue-ops cadences to track churn and spend jointly.'
+]
+
+LIMITATIONS = [
+    'Single snapshot data?seasonality and campaign impacts require longitudinal validation.',
+    'Logistic propensity model offers +0.02 AUC lift; explore gradient boosting and survival analysis for stronger ranking.',
+    'Support taxonomy lacks qualitative root causes?integrate ticket text analytics next.',
+    'Pricing sensitivity not modelled; incorporate spend-to-income ratio into elasticity testing.',
+]
+
+
+@dataclass
+class ReportJob:
+    """Everything needed to write one insight PDF without touching the raw data."""
+
+    pdf_path: Path
+    kpis: Dict[str, object]
+    figures: List[Tuple[str, Path]]
+    scope: str = ""
+    high_risk_share: Optional[float] = None
+    premium_cluster: Optional[Dict[str, float]] = None
+    narrative: bool = True
+
+
+def _rate(kpis: Dict[str, object], *keys: str) -> float:
+    value = kpis
+    for key in keys:
+        value = value[key]
+    return float(value["value"] * 100)
+
+
+def load_kpis(kpi_path: Path = KPI_SUMMARY_PATH, clean_path: Path = CLEAN_PATH) -> Dict[str, object]:
+    """Read the pipeline KPI summary, streaming the clean CSV only if it is missing."""
+    if kpi_path.exists():
+        return load_kpi_summary(kpi_path)
+    return compute_kpi_summary(pd.read_csv(clean_path, chunksize=100_000))
+
+
+def write_insight_pdf(job: ReportJob) -> Path:
+    """Lay out one insight PDF from precomputed KPIs and rendered figures."""
+    from fpdf import FPDF
+
+    kpis = job.kpis
+    n_customers = int(kpis["customers"])
+    churn_rate = _rate(kpis, "churn_rate")
+    app_adoption = _rate(kpis, "app_adoption")
+    avg_monthly_revenue = float(kpis["avg_monthly_revenue"]["value"])
+    churn_with_app = _rate(kpis, "churn_rate_by_app", "with_app")
+    churn_without_app = _rate(kpis, "churn_rate_by_app", "without_app")
+    churn_low_support = _rate(kpis, "churn_rate_by_support", "0-0.2")
+    churn_high_support = _rate(kpis, "churn_rate_by_support", "0.5-1.5")
+
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=12)
+    pdf.add_page()
+    pdf.set_font('Arial', 'B', 18)
+    title = 'Data Science Case Study: From Data Audit to Decision Insights'
+    pdf.cell(0, 12, f"{title} - {job.scope}" if job.scope else title, ln=True)
+
+    pdf.set_font('Arial', '', 12)
+    pdf.multi_cell(0, 7, 'Nationwide telecom subscriber dataset (20k rows, 30 features) progressed through audit, quality checks, EDA, statistical testing, clustering, and retention scoring to inform executive decisions.')
+
+    pdf.ln(2)
+    pdf.set_font('Arial', 'B', 14)
+    pdf.cell(0, 10, 'Executive Summary', ln=True)
+    pdf.set_font('Arial', '', 12)
+    exec_lines = [
+        f"Analysed {n_customers:,} subscribers with an overall churn rate of {churn_rate:.1f}% and average monthly revenue of $ {avg_monthly_revenue:.2f}.",
+        f"Mobile app adoption at {app_adoption:.1f}% cuts churn from {churn_without_app:.1f}% to {churn_with_app:.1f}%.",
+        f"High-support customers churn {churn_high_support:.1f}% vs {churn_low_support:.1f}% for low-touch peers.",
+    ]
+    if job.premium_cluster is not None:
+        exec_lines.append(
+            f"K-means identifies a 19% Premium Data cluster driving $ {job.premium_cluster['next_month_spend_mean']:.2f} future spend."
+        )
+    if job.high_risk_share is not None:
+        exec_lines.append(
+            f"Propensity scoring surfaces the riskiest {job.high_risk_share:.1f}% of accounts for concierge retention pilots."
+        )
+    for line in exec_lines:
+        pdf.multi_cell(0, 7, f"- {line}")
+
+    if job.narrative:
+        pdf.ln(2)
+        pdf.set_font('Arial', 'B', 14)
+        pdf.cell(0, 10, 'Key Insights', ln=True)
+        pdf.set_font('Arial', 'B', 12)
+        pdf.cell(0, 8, 'Retention & Experience', ln=True)
+        pdf.set_font('Arial', '', 12)
+        pdf.multi_cell(0, 6, f"? App-less customers churn {churn_without_app - churn_with_app:.1f} pts more; digital adoption remains the single strongest lever.\n? Support-heavy cohorts carry ~{churn_high_support / churn_low_support if churn_low_support else 0:.2f}x churn odds, validating concierge outreach.\n? 5.5k high-risk accounts combine support load and low app usage?prime targets for the retention pilot.")
+
+        if job.premium_cluster is not None:
+            pdf.set_font('Arial', 'B', 12)
+            pdf.cell(0, 8, 'Revenue & Usage', ln=True)
+            pdf.set_font('Arial', '', 12)
+            pdf.multi_cell(0, 6, f"? Premium Data Power Users (Cluster {int(job.premium_cluster['cluster'])}) spend $ {job.premium_cluster['next_month_spend_mean']:.2f} monthly with highest charges and engagement.\n? Value Seekers (Cluster 2) mirror low-spend users but generate more tickets?bundle upgrades plus app education improve margin.")
+
+        pdf.set_font('Arial', 'B', 12)
+        pdf.cell(0, 8, 'Geography & Trends', ln=True)
+        pdf.set_font('Arial', '', 12)
+        pdf.multi_cell(0, 6, "? Matabeleland North and Manicaland exhibit the steepest churn pockets needing localised retention squads.\n? Mid-2025 churn spikes coincide with spend dips, reinforcing proactive monitoring via the dashboard filters.")
+
+    for caption, path in job.figures:
+        if not path.exists():
+            continue
+        pdf.add_page()
+        pdf.set_font('Arial', 'B', 14)
+        pdf.cell(0, 10, 'Visual Evidence', ln=True)
+        pdf.set_font('Arial', 'B', 12)
+        pdf.cell(0, 8, caption, ln=True)
+        pdf.ln(1)
+        pdf.image(str(path), w=180)
+
+    if job.narrative:
+        pdf.add_page()
+        pdf.set_font('Arial', 'B', 14)
+        pdf.cell(0, 10, 'Recommendations', ln=True)
+        pdf.set_font('Arial', '', 12)
+        for rec in RECOMMENDATIONS:
+            pdf.multi_cell(0, 7, f"- {rec}")
+
+        pdf.ln(2)
+        pdf.set_font('Arial', 'B', 14)
+        pdf.cell(0, 10, 'Limitations & Next Steps', ln=True)
+        pdf.set_font('Arial', '', 12)
+        for item in LIMITATIONS:
+            pdf.multi_cell(0, 7, f"- {item}")
+
+    job.pdf_path.parent.mkdir(parents=True, exist_ok=True)
+    pdf.output(str(job.pdf_path))
+    return job.pdf_path
+
+
+def write_pdfs(jobs: Sequence[ReportJob], *, max_workers: Optional[int] = None) -> List[Path]:
+    """Write several PDFs on a process pool (inline when there is only one)."""
+    if len(jobs) <= 1 or max_workers == 1:
+        return [write_insight_pdf(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(write_insight_pdf, jobs))
+
+
+def build_global_report(
+    *,
+    pdf_path: Path = PDF_PATH,
+    figure_dir: Path = FIGURE_DIR,
+    max_workers: Optional[int] = None,
+) -> Path:
+    """Build the nationwide insight summary PDF.
+
+    Figures are re-aggregated from the clean CSV only when it changed since
+    the figures in ``figure_dir`` were rendered or one of them is missing.
+    """
+    kpis = load_kpis(KPI_SUMMARY_PATH, CLEAN_PATH)
+    fingerprint = source_fingerprint(CLEAN_PATH)
+    figures = cached_figures(figure_dir, fingerprint)
+    if figures is None:
+        figure_data = pd.read_csv(CLEAN_PATH, usecols=FIGURE_COLUMNS, parse_dates=["last_seen"])
+        tasks = report_figure_tasks(figure_data, figure_dir)
+        render_figures(tasks, max_workers=max_workers)
+        record_figure_source(figure_dir, fingerprint, tasks)
+        figures = [(task.caption, task.path) for task in tasks]
+
+    churn_probability = pd.read_csv(SEGMENTED_PATH, usecols=["churn_probability"])["churn_probability"]
+    high_risk_share = float((churn_probability >= churn_probability.quantile(0.75)).mean() * 100)
+    cluster_summary = pd.read_csv(SEGMENT_SUMMARY_PATH)
+    premium_cluster = cluster_summary.loc[cluster_summary["monthly_charges_mean"].idxmax()].to_dict()
+
+    job = ReportJob(
+        pdf_path=pdf_path,
+        kpis=kpis,
+        figures=figures,
+        high_risk_share=high_risk_share,
+        premium_cluster=premium_cluster,
+    )
+    return write_insight_pdf(job)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Build the insight summary PDF.")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size for rendering")
+    args = parser.parse_args(argv)
+    print(build_global_report(max_workers=args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""Shared query service for the dashboard's filtered aggregates.
+
+One process holds the clean dataset (only the columns the charts use) and
+answers every session's section queries, so N analysts applying the same
+filters cost one groupby instead of N. Results live in a shared LRU cache keyed
+by the normalized filter state, and concurrent identical requests are
+coalesced onto a single in-flight computation.
+
+    python -m src.reporting.query_service --port 8765
+    CHURN_QUERY_SERVICE_URL=http://127.0.0.1:8765 streamlit run streamlit_app.py
+
+Without ``CHURN_QUERY_SERVICE_URL`` the dashboard runs a :class:`QueryService`
+in-process, which still shares the cache between sessions of that process.
+Either way the dashboard keeps its per-process ``st.cache_data`` helpers in
+front of the service. The remote service pays off once several dashboard
+processes share it: each filter state is computed once for all of them
+(``python -m benchmarks.load_test``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+from urllib.request import urlopen
+
+import pandas as pd
+
+from src.pipelines.partitions import PARTITIONED_DATA_PATH, read_months
+from src.reporting.aggregations import (
+    SUPPORT_BAND_OPTIONS,
+    churn_rate_by,
+    filter_customers,
+    geo_cube,
+    monthly_churn_spend,
+    province_summary_from_cube,
+    support_band_churn,
+)
+from src.reporting.figures import FIGURE_COLUMNS
+from src.utils.cache import LRUCache
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+CLEAN_PATH = PROJECT_ROOT / "data" / "processed" / "clean_dataset.csv"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 512
+
+FilterState = Tuple[Tuple[str, ...], Tuple[str, ...], str]
+
+
+def normalize_filters(
+    plans: Optional[Sequence[str]] = None,
+    provinces: Optional[Sequence[str]] = None,
+    support_band: str = "All",
+) -> FilterState:
+    """Canonical, hashable form of the sidebar filters (order and duplicates ignored)."""
+    if support_band not in SUPPORT_BAND_OPTIONS:
+        raise ValueError(f"Unknown support band: {support_band!r}")
+    return tuple(sorted(set(plans or ()))), tuple(sorted(set(provinces or ()))), support_band
+
+
+def _series_frame(series: pd.Series, index_name: str, value_name: str) -> pd.DataFrame:
+    return series.rename(value_name).rename_axis(index_name).reset_index()
+
+
+# name -> aggregate over the filtered customers; "geo" is answered from the cube.
+QUERIES: Dict[str, Callable[[pd.DataFrame], pd.DataFrame]] = {
+    "count": lambda df: pd.DataFrame({"customers": [len(df)]}),
+    "trend": monthly_churn_spend,
+    "plan_churn": lambda df: _series_frame(churn_rate_by(df, "plan_type"), "plan_type", "churn_rate"),
+    "app_churn": lambda df: _series_frame(churn_rate_by(df, "has_app"), "has_app", "churn_rate"),
+    "support_churn": lambda df: _series_frame(support_band_churn(df), "support_segment", "churn_rate_pct"),
+}
+QUERY_NAMES = tuple(QUERIES) + ("geo",)
+
+
+class QueryService:
+    """Answer dashboard section queries with a shared cache and request coalescing.
+
+    Cached frames are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, clean: pd.DataFrame, *, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self.clean = clean
+        self.cube = geo_cube(clean)
+        self.cache = LRUCache(cache_size)
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "hits": 0, "coalesced": 0, "computed": 0}
+
+    @classmethod
+    def from_csv(cls, path: Path = CLEAN_PATH, **kwargs) -> "QueryService":
+        """Load only the chart columns of the clean dataset."""
+        return cls(pd.read_csv(path, usecols=FIGURE_COLUMNS, parse_dates=["last_seen"]), **kwargs)
+
+    @classmethod
+    def from_partitions(
+        cls, root: Path = PARTITIONED_DATA_PATH, *, start: Optional[str] = None, **kwargs
+    ) -> "QueryService":
+        """Load the chart columns of the months since ``start`` from the partitioned store."""
+        return cls(read_months(root, start=start, columns=FIGURE_COLUMNS), **kwargs)
+
+    def _compute(self, name: str, state: FilterState) -> pd.DataFrame:
+        if name == "geo":
+            return province_summary_from_cube(self.cube, *state)
+        return QUERIES[name](filter_customers(self.clean, *state))
+
+    def query(
+        self,
+        name: str,
+        plans: Optional[Sequence[str]] = None,
+        provinces: Optional[Sequence[str]] = None,
+        support_band: str = "All",
+    ) -> pd.DataFrame:
+        """Return aggregate ``name`` for the given filters."""
+        if name not in QUERY_NAMES:
+            raise ValueError(f"Unknown query: {name!r}")
+        state = normalize_filters(plans, provinces, support_band)
+        key = (name,) + state
+        with self._lock:
+            self.stats["requests"] += 1
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.stats["hits"] += 1
+                return cached
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self.stats["coalesced"] += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._compute(name, state)
+        except Exception as exc:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            self.cache.put(key, result)
+            self.stats["computed"] += 1
+            self._inflight.pop(key, None)
+        future.set_result(result)
+        return result
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.stats, "cached": len(self.cache)}
+
+
+def _to_payload(frame: pd.DataFrame) -> bytes:
+    return frame.to_json(orient="split", index=False, date_format="iso").encode("utf-8")
+
+
+def _from_payload(payload: bytes) -> pd.DataFrame:
+    data = json.loads(payload)
+    frame = pd.DataFrame(data["data"], columns=data["columns"])
+    if "month" in frame:
+        frame["month"] = pd.to_datetime(frame["month"]).dt.tz_localize(None)
+    return frame
+
+
+def make_server(service: QueryService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """HTTP front end: ``GET /query?name=trend&plan=...&province=...&support_band=...``."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: bytes) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            params = parse_qs(url.query)
+            if url.path == "/stats":
+                self._send(200, json.dumps(service.snapshot()).encode("utf-8"))
+                return
+            if url.path != "/query":
+                self._send(404, b'{"error": "not found"}')
+                return
+            try:
+                frame = service.query(
+                    params.get("name", [""])[0],
+                    params.get("plan", []),
+                    params.get("province", []),
+                    params.get("support_band", ["All"])[0],
+                )
+            except ValueError as exc:
+                self._send(400, json.dumps({"error": str(exc)}).encode("utf-8"))
+                return
+            except Exception as exc:
+                self._send(500, json.dumps({"error": f"{type(exc).__name__}: {exc}"}).encode("utf-8"))
+                return
+            self._send(200, _to_payload(frame))
+
+        def log_message(self, format, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+class QueryClient:
+    """Dashboard-side client with the same ``query`` signature as :class:`QueryService`."""
+
+    def __init__(self, base_url: str, *, timeout: float = 30.0) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def query(
+        self,
+        name: str,
+        plans: Optional[Sequence[str]] = None,
+        provinces: Optional[Sequence[str]] = None,
+        support_band: str = "All",
+    ) -> pd.DataFrame:
+        params = [("name", name), ("support_band", support_band)]
+        params += [("plan", plan) for plan in plans or ()]
+        params += [("province", province) for province in provinces or ()]
+        with urlopen(f"{self.base_url}/query?{urlencode(params)}", timeout=self.timeout) as response:
+            return _from_payload(response.read())
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Serve dashboard aggregates from a shared cache.")
+    parser.add_argument("--data", type=Path, default=CLEAN_PATH)
+    parser.add_argument("--partitions", type=Path, help="Serve from the month-partitioned store instead")
+    parser.add_argument("--start", help="First month (YYYY-MM) to load from --partitions")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.partitions is not None:
+        service = QueryService.from_partitions(args.partitions, start=args.start, cache_size=args.cache_size)
+    else:
+        service = QueryService.from_csv(args.data, cache_size=args.cache_size)
+    server = make_server(service, args.host, args.port)
+    print(f"Serving {len(service.clean):,} customers on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""Per-stage instrumentation hooks shared by the pipeline, experiments and dashboard.
+
+Decorate a stage with :func:`instrument_stage` and, once tracing is enabled,
+every call emits one structured JSON record with wall time, CPU time, peak
+memory delta, input/output row counts and how many values the stage changed.
+Tracing is off by default and costs a single flag check per call. Enable it
+in code with :func:`enable_tracing` or through the environment::
+
+    CHURN_TRACE_LOG=reports/trace.jsonl CHURN_TRACE_PROFILE_DIR=reports/profiles \\
+        python -m src.pipelines.preprocessing
+
+Stage stacks are per thread, so concurrent dashboard sessions do not pop each
+other's frames. ``tracemalloc`` is process-wide, though: when stages overlap
+across threads, or tracing was started by someone else (e.g. a benchmark),
+peaks are not reset and the record carries ``peak_memory_shared: true``.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+
+logger = logging.getLogger("churn.trace")
+
+
+@dataclass
+class TraceConfig:
+    """Active tracing options; ``enabled`` is checked on every stage call."""
+
+    enabled: bool = False
+    log_path: Optional[Path] = None
+    profile_dir: Optional[Path] = None
+    profiler: str = "cprofile"
+    track_memory: bool = True
+    compare_values: bool = True
+    trace_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+
+_config = TraceConfig()
+# Per-thread stage stacks and profiler flag; ``_open_frames`` spans all threads.
+_local = threading.local()
+_memory_lock = threading.Lock()
+_open_frames: List[Dict[str, object]] = []
+_owns_tracemalloc = False
+
+
+def enable_tracing(
+    log_path: Optional[Path] = None,
+    *,
+    profile_dir: Optional[Path] = None,
+    profiler: str = "cprofile",
+    track_memory: bool = True,
+    compare_values: bool = True,
+    trace_id: Optional[str] = None,
+) -> TraceConfig:
+    """Turn on stage tracing for this process.
+
+    Records are logged on the ``churn.trace`` logger and, when ``log_path`` is
+    given, appended to it as JSON lines. ``profile_dir`` additionally dumps a
+    per-stage profile (``cprofile`` ``.prof`` or ``pyinstrument`` ``.html``).
+    Pass the same ``trace_id`` from different processes to stitch one trace.
+    """
+    global _config
+    if profiler not in {"cprofile", "pyinstrument"}:
+        raise ValueError(f"Unknown profiler: {profiler}")
+    _config = TraceConfig(
+        enabled=True,
+        log_path=Path(log_path) if log_path else None,
+        profile_dir=Path(profile_dir) if profile_dir else None,
+        profiler=profiler,
+        track_memory=track_memory,
+        compare_values=compare_values,
+        trace_id=trace_id or uuid.uuid4().hex,
+    )
+    return _config
+
+
+def disable_tracing() -> None:
+    """Turn stage tracing off."""
+    global _config
+    _config = TraceConfig()
+
+
+def tracing_enabled() -> bool:
+    return _config.enabled
+
+
+def _first_frame(args, kwargs) -> Optional[pd.DataFrame]:
+    for value in list(args) + list(kwargs.values()):
+        if isinstance(value, pd.DataFrame):
+            return value
+    return None
+
+
+def count_changes(before: pd.DataFrame, after: pd.DataFrame) -> Dict[str, object]:
+    """Count values a row-preserving stage changed, per shared column.
+
+    Only meaningful when both frames share an index (e.g. ``impute_missing``
+    or ``cap_outliers``); returns an empty dict otherwise.
+    """
+    if len(before) != len(after) or not before.index.equals(after.index):
+        return {}
+    changed: Dict[str, int] = {}
+    nulls_filled = 0
+    for column in before.columns.intersection(after.columns):
+        old, new = before[column], after[column]
+        old_na, new_na = old.isna().to_numpy(), new.isna().to_numpy()
+        try:
+            equal = (old.to_numpy() == new.to_numpy()) | (old_na & new_na)
+        except (TypeError, ValueError):
+            continue
+        n_changed = int((~equal).sum())
+        if n_changed:
+            changed[column] = n_changed
+        nulls_filled += int((old_na & ~new_na).sum())
+    return {
+        "values_changed": int(sum(changed.values())),
+        "nulls_filled": nulls_filled,
+        "changed_by_column": changed,
+    }
+
+
+def _thread_stack() -> List[Dict[str, object]]:
+    stack = getattr(_local, "memory_stack", None)
+    if stack is None:
+        stack = _local.memory_stack = []
+    return stack
+
+
+def _start_memory() -> Dict[str, object]:
+    global _owns_tracemalloc
+    stack = _thread_stack()
+    thread = threading.get_ident()
+    with _memory_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _owns_tracemalloc = True
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+        overlapping = any(frame["thread"] != thread for frame in _open_frames)
+        shared = overlapping or not _owns_tracemalloc
+        if overlapping:
+            for other in _open_frames:
+                other["shared"] = True
+        if not shared:
+            tracemalloc.reset_peak()
+        frame = {"start": current, "peak": current, "thread": thread, "shared": shared}
+        _open_frames.append(frame)
+    stack.append(frame)
+    return frame
+
+
+def _stop_memory(frame: Dict[str, object]) -> int:
+    """Peak allocation delta of ``frame``; stops tracemalloc only if this module started it."""
+    global _owns_tracemalloc
+    stack = _thread_stack()
+    with _memory_lock:
+        peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+        stack.pop()
+        _open_frames.remove(frame)
+        if stack:
+            stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+        if not _open_frames and _owns_tracemalloc:
+            tracemalloc.stop()
+            _owns_tracemalloc = False
+    return peak - frame["start"]
+
+
+def _profile(stage: str, func: Callable, args, kwargs):
+    """Run ``func`` under the configured profiler and dump its stats.
+
+    A thread has one active profiler, so a profiled stage called from inside
+    another profiled stage runs unprofiled and is covered by the outer dump.
+    Composite stages that only call other stages are declared with
+    ``profile=False`` so each inner stage gets its own dump.
+    """
+    if getattr(_local, "profiling", False):
+        return func(*args, **kwargs)
+    _local.profiling = True
+    try:
+        return _run_profiler(stage, func, args, kwargs)
+    finally:
+        _local.profiling = False
+
+
+def _run_profiler(stage: str, func: Callable, args, kwargs):
+    profile_dir = _config.profile_dir
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    if _config.profiler == "pyinstrument":
+        from pyinstrument import Profiler
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.stop()
+            (profile_dir / f"{stage}.html").write_text(profiler.output_html())
+
+    import cProfile
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args, **kwargs)
+    finally:
+        profiler.dump_stats(str(profile_dir / f"{stage}.prof"))
+
+
+def emit(record: Dict[str, object]) -> None:
+    """Write one trace record to the logger and, if configured, the JSONL file."""
+    line = json.dumps({"trace_id": _config.trace_id, **record}, default=str)
+    logger.info(line)
+    if _config.log_path is not None:
+        _config.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with _config.log_path.open("a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+
+def instrument_stage(component: str, name: Optional[str] = None, *, profile: bool = True) -> Callable:
+    """Decorate a stage so it is traced whenever tracing is enabled.
+
+    ``component`` groups stages in the trace (``pipeline``, ``experiments``,
+    ``dashboard``); ``name`` defaults to the function name. Pass
+    ``profile=False`` for entry points such as ``run_pipeline`` or ``main``
+    that mostly call other instrumented stages: they still get a trace
+    record, but no profile dump of their own.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        stage = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _config.enabled:
+                return func(*args, **kwargs)
+
+            frame_in = _first_frame(args, kwargs)
+            memory = _start_memory() if _config.track_memory else None
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            status = "ok"
+            result = None
+            try:
+                if profile and _config.profile_dir is not None:
+                    result = _profile(f"{component}.{stage}", func, args, kwargs)
+                else:
+                    result = func(*args, **kwargs)
+                return result
+            except Exception:
+                status = "error"
+                raise
+            finally:
+                record: Dict[str, object] = {
+                    "trace_id": _config.trace_id,
+                    "component": component,
+                    "stage": stage,
+                    "status": status,
+                    "wall_seconds": round(time.perf_counter() - wall_start, 6),
+                    "cpu_seconds": round(time.process_time() - cpu_start, 6),
+                }
+                if memory is not None:
+                    record["peak_memory_delta_mb"] = round(_stop_memory(memory) / 1e6, 3)
+                    if memory["shared"]:
+                        record["peak_memory_shared"] = True
+                if frame_in is not None:
+                    record["rows_in"] = len(frame_in)
+                if isinstance(result, pd.DataFrame):
+                    record["rows_out"] = len(result)
+                    if _config.compare_values and frame_in is not None and result is not frame_in:
+                        record.update(count_changes(frame_in, result))
+                emit(record)
+
+        return wrapper
+
+    return decorator
+
+
+if os.environ.get("CHURN_TRACE_LOG") or os.environ.get("CHURN_TRACE_PROFILE_DIR"):
+    enable_tracing(
+        os.environ.get("CHURN_TRACE_LOG") or None,
+        profile_dir=os.environ.get("CHURN_TRACE_PROFILE_DIR") or None,
+        profiler=os.environ.get("CHURN_TRACE_PROFILER", "cprofile"),
+        trace_id=os.environ.get("CHURN_TRACE_ID") or None,
+    )
@@ -1,27 +1,44 @@
-"""Visualization helpers for exploratory and explanatory graphics."""
+"""Visualization helpers for exploratory and explanatory graphics.
+
+matplotlib and seaborn are imported, and the seaborn theme applied, on the
+first plotting call rather than at import time.
+"""
 
 from __future__ import annotations
 
-import matplotlib.pyplot as plt
-import seaborn as sns
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
 
-sns.set_theme(style='whitegrid')
+@lru_cache(maxsize=None)
+def _seaborn():
+    """Import seaborn and apply the shared theme once per process."""
+    import seaborn as sns
+
+    sns.set_theme(style='whitegrid')
+    return sns
 
 
 def configure_figsize(width: float = 10, height: float = 6) -> None:
     """Apply a global default figure size for consistency."""
+    import matplotlib.pyplot as plt
+
+    _seaborn()
     plt.rcParams['figure.figsize'] = (width, height)
 
 
 def histogram(series, *, bins: int = 30, title: str = '') -> plt.Axes:
     """Plot a histogram with seaborn defaults and return the axes."""
-    ax = sns.histplot(series, bins=bins, kde=True)
+    ax = _seaborn().histplot(series, bins=bins, kde=True)
     ax.set_title(title)
     return ax
 
 
 def barplot(data, *, x: str, y: str, title: str = '', order=None) -> plt.Axes:
     """Create a barplot with labels and ordering control."""
-    ax = sns.barplot(data=data, x=x, y=y, order=order)
+    ax = _seaborn().barplot(data=data, x=x, y=y, order=order)
     ax.set_title(title)
     return ax
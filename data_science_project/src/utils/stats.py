@@ -1,12 +1,19 @@
-"""Statistical helper functions shared across notebooks."""
+"""Statistical helper functions shared across notebooks.
+
+SciPy is imported inside the functions that need it: the pipeline and
+reporting modules import this file for its numpy-only helpers, and loading
+``scipy.stats`` up front dominated their import time.
+"""
 
 from __future__ import annotations
 
-from typing import Iterable, Tuple
+from dataclasses import dataclass
+from itertools import combinations, islice
+from statistics import NormalDist
+from typing import Iterable, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
-from scipy import stats
 
 
 def summarize_numeric(series: pd.Series) -> pd.Series:
@@ -16,6 +23,8 @@ def summarize_numeric(series: pd.Series) -> pd.Series:
 
 def cramers_v(confusion_matrix: pd.DataFrame) -> float:
     """Compute Cramer's V statistic for categorical association."""
+    from scipy import stats
+
     chi2 = stats.chi2_contingency(confusion_matrix)[0]
     n = confusion_matrix.to_numpy().sum()
     r, k = confusion_matrix.shape
@@ -23,9 +32,328 @@ def cramers_v(confusion_matrix: pd.DataFrame) -> float:
 
 
 def confidence_interval(data: Iterable[float], confidence: float = 0.95) -> Tuple[float, float]:
-    """Calculate a confidence interval for the mean of numeric data."""
-    array = np.array(list(data))
-    mean = array.mean()
-    sem = stats.sem(array)
-    margin = sem * stats.t.ppf((1 + confidence) / 2.0, len(array) - 1)
-    return mean - margin, mean + margin
+    """Calculate a confidence interval for the mean of numeric data.
+
+    The input is consumed in fixed-size chunks through :class:`RunningMoments`,
+    so generators and large iterables are never materialized in full.
+    """
+    if isinstance(data, (np.ndarray, pd.Series)):
+        return RunningMoments().update(data).confidence_interval(confidence)
+    moments = RunningMoments()
+    iterator = iter(data)
+    while True:
+        chunk = np.fromiter(islice(iterator, 65536), dtype=float)
+        if chunk.size == 0:
+            break
+        moments.update(chunk)
+    return moments.confidence_interval(confidence)
+
+
+@dataclass
+class RunningMoments:
+    """Mergeable Welford accumulator for count, mean and variance.
+
+    Feed values with :meth:`update` (scalars, arrays or chunks) and combine
+    partial results from parallel workers with :meth:`merge`. NaNs are skipped.
+    """
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def update(self, values) -> "RunningMoments":
+        """Fold a scalar or array chunk into the running moments."""
+        array = np.asarray(values, dtype=float).ravel()
+        array = array[~np.isnan(array)]
+        if array.size:
+            chunk_mean = float(array.mean())
+            chunk = RunningMoments(
+                int(array.size), chunk_mean, float(((array - chunk_mean) ** 2).sum())
+            )
+            self._absorb(chunk)
+        return self
+
+    def merge(self, other: "RunningMoments") -> "RunningMoments":
+        """Return a new accumulator combining ``self`` and ``other``."""
+        combined = RunningMoments(self.count, self.mean, self.m2)
+        combined._absorb(other)
+        return combined
+
+    def _absorb(self, other: "RunningMoments") -> None:
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta**2 * self.count * other.count / total
+        self.count = total
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (``ddof=1``)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else float('nan')
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+    def confidence_interval(self, confidence: float = 0.95) -> Tuple[float, float]:
+        """t-based confidence interval for the mean."""
+        if self.count < 2:
+            return float('nan'), float('nan')
+        from scipy import stats
+
+        sem = self.std / np.sqrt(self.count)
+        margin = sem * stats.t.ppf((1 + confidence) / 2.0, self.count - 1)
+        return self.mean - margin, self.mean + margin
+
+
+@dataclass
+class RunningProportion:
+    """Mergeable success/trial counter with Wilson score intervals."""
+
+    successes: int = 0
+    count: int = 0
+
+    def update(self, values) -> "RunningProportion":
+        """Fold a scalar or array chunk of 0/1 (or boolean) outcomes."""
+        array = np.asarray(values, dtype=float).ravel()
+        array = array[~np.isnan(array)]
+        self.successes += int(array.sum())
+        self.count += int(array.size)
+        return self
+
+    def merge(self, other: "RunningProportion") -> "RunningProportion":
+        """Return a new accumulator combining ``self`` and ``other``."""
+        return RunningProportion(self.successes + other.successes, self.count + other.count)
+
+    @property
+    def proportion(self) -> float:
+        return self.successes / self.count if self.count else float('nan')
+
+    def confidence_interval(self, confidence: float = 0.95) -> Tuple[float, float]:
+        """Wilson score interval for the proportion."""
+        low, high = wilson_interval(self.successes, self.count, confidence)
+        return float(low), float(high)
+
+
+def wilson_interval(successes, n, confidence: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized Wilson score interval for one or many binomial proportions."""
+    successes = np.asarray(successes, dtype=float)
+    n = np.asarray(n, dtype=float)
+    z = NormalDist().inv_cdf((1 + confidence) / 2.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p = successes / n
+        denom = 1 + z**2 / n
+        centre = (p + z**2 / (2 * n)) / denom
+        margin = z * np.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / denom
+    return centre - margin, centre + margin
+
+
+def adjust_pvalues(p_values, method: str = 'holm') -> np.ndarray:
+    """Correct a vector of p-values for multiple testing.
+
+    Supports ``bonferroni``, ``holm`` (step-down FWER) and ``fdr_bh``
+    (Benjamini-Hochberg). NaN p-values are passed through untouched.
+    """
+    p = np.asarray(p_values, dtype=float)
+    adjusted = np.full_like(p, np.nan)
+    valid = ~np.isnan(p)
+    pv = p[valid]
+    m = pv.size
+    if m == 0:
+        return adjusted
+
+    if method == 'bonferroni':
+        out = pv * m
+    elif method == 'holm':
+        order = np.argsort(pv)
+        stepped = np.maximum.accumulate((m - np.arange(m)) * pv[order])
+        out = np.empty(m)
+        out[order] = stepped
+    elif method == 'fdr_bh':
+        order = np.argsort(pv)[::-1]
+        ranks = m - np.arange(m)
+        stepped = np.minimum.accumulate(pv[order] * m / ranks)
+        out = np.empty(m)
+        out[order] = stepped
+    else:
+        raise ValueError(f"Unknown correction method: {method}")
+
+    adjusted[valid] = np.clip(out, 0.0, 1.0)
+    return adjusted
+
+
+def cramers_v_matrix(df: pd.DataFrame, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Compute Cramer's V for every pair of categorical columns in one pass.
+
+    All columns are factorized and stacked into a sparse one-hot indicator
+    matrix ``X``; ``X.T @ X`` then holds every pairwise contingency table as a
+    block, so chi-square contributions are evaluated for all pairs at once and
+    summed per block. Missing values are treated as their own level. No Yates
+    continuity correction is applied, so 2x2 results differ slightly from
+    :func:`cramers_v`.
+    """
+    from scipy import sparse
+
+    if columns is None:
+        columns = list(df.select_dtypes(include=['object', 'category', 'bool']).columns)
+    columns = list(columns)
+    n = len(df)
+
+    codes, sizes = [], []
+    for col in columns:
+        col_codes, uniques = pd.factorize(df[col], use_na_sentinel=False)
+        codes.append(col_codes)
+        sizes.append(len(uniques))
+    sizes = np.asarray(sizes)
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    rows = np.tile(np.arange(n), len(columns))
+    cols = (np.stack(codes) + offsets[:, None]).ravel()
+    indicator = sparse.csr_matrix(
+        (np.ones(rows.size), (rows, cols)), shape=(n, int(sizes.sum()))
+    )
+    observed = (indicator.T @ indicator).toarray()
+
+    level_counts = np.diag(observed)
+    expected = np.outer(level_counts, level_counts) / n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        contributions = np.where(expected > 0, (observed - expected) ** 2 / expected, 0.0)
+    chi2 = np.add.reduceat(np.add.reduceat(contributions, offsets, axis=0), offsets, axis=1)
+
+    min_dim = np.minimum.outer(sizes, sizes) - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v = np.sqrt((chi2 / n) / min_dim)
+    v[min_dim == 0] = np.nan
+    np.fill_diagonal(v, 1.0)
+    return pd.DataFrame(v, index=columns, columns=columns)
+
+
+def group_moments(values: np.ndarray, codes: np.ndarray, n_groups: int):
+    """Return per-group count, mean and sample variance for each column.
+
+    ``values`` is an ``(n, m)`` array and ``codes`` an ``(n,)`` array of group
+    ids in ``[0, n_groups)``; rows with negative codes and NaN cells are
+    ignored. Results have shape ``(n_groups, m)``.
+    """
+    n, m = values.shape
+    keep = codes >= 0
+    values = values[keep]
+    codes = codes[keep]
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+
+    flat = (codes[:, None] * m + np.arange(m)).ravel()
+    size = n_groups * m
+    count = np.bincount(flat, weights=valid.ravel(), minlength=size).reshape(n_groups, m)
+    total = np.bincount(flat, weights=filled.ravel(), minlength=size).reshape(n_groups, m)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = total / count
+    centred = np.where(valid, values - mean[codes], 0.0)
+    sq = np.bincount(flat, weights=(centred**2).ravel(), minlength=size).reshape(n_groups, m)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        var = sq / (count - 1)
+    return count, mean, var
+
+
+def _welch_from_moments(n_a, mean_a, var_a, n_b, mean_b, var_b) -> dict:
+    """Welch t statistics and effect sizes from summary arrays."""
+    from scipy import stats
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        se_a = var_a / n_a
+        se_b = var_b / n_b
+        t_stat = (mean_a - mean_b) / np.sqrt(se_a + se_b)
+        dof = (se_a + se_b) ** 2 / (se_a**2 / (n_a - 1) + se_b**2 / (n_b - 1))
+        p_value = 2 * stats.t.sf(np.abs(t_stat), dof)
+
+        pooled_dof = n_a + n_b - 2
+        pooled_std = np.sqrt(((n_a - 1) * var_a + (n_b - 1) * var_b) / pooled_dof)
+        d = (mean_a - mean_b) / pooled_std
+        g = d * (1 - 3 / (4 * pooled_dof - 1))
+    return {
+        'n_a': n_a,
+        'n_b': n_b,
+        'mean_a': mean_a,
+        'mean_b': mean_b,
+        'mean_diff': mean_a - mean_b,
+        't_stat': t_stat,
+        'dof': dof,
+        'p_value': p_value,
+        'cohens_d': d,
+        'hedges_g': g,
+    }
+
+
+def welch_ttests(
+    df: pd.DataFrame,
+    metrics: Sequence[str],
+    group: str = 'churned',
+    *,
+    correction: Optional[str] = 'fdr_bh',
+) -> pd.DataFrame:
+    """Run Welch t-tests and effect sizes for many metrics against a binary split.
+
+    Group ``a`` is the truthy side of ``group`` (e.g. churners) and ``b`` the
+    rest, so positive effect sizes mean higher values among churners. Moments
+    for every metric are computed in a single vectorized pass.
+    """
+    metrics = list(metrics)
+    values = df[metrics].to_numpy(dtype=float)
+    split = df[group]
+    codes = np.where(split.isna(), -1, split.astype(bool).to_numpy().astype(int))
+    count, mean, var = group_moments(values, codes, 2)
+
+    result = pd.DataFrame(
+        _welch_from_moments(count[1], mean[1], var[1], count[0], mean[0], var[0]),
+        index=pd.Index(metrics, name='metric'),
+    )
+    if correction:
+        result['p_adjusted'] = adjust_pvalues(result['p_value'].to_numpy(), correction)
+    return result
+
+
+def pairwise_group_tests(
+    df: pd.DataFrame,
+    metrics: Sequence[str],
+    group: str,
+    *,
+    pairs: Optional[Sequence[Tuple[object, object]]] = None,
+    correction: Optional[str] = 'holm',
+) -> pd.DataFrame:
+    """Compare every pair of group levels (e.g. tenure bands) on many metrics.
+
+    Per-level moments are computed once; Welch statistics for all requested
+    level pairs and metrics are then evaluated as broadcast array operations.
+    Pass ``pairs`` to restrict comparisons (e.g. adjacent bands only). The
+    multiple-testing correction is applied across the full family of tests.
+    """
+    metrics = list(metrics)
+    values = df[metrics].to_numpy(dtype=float)
+    grouping = df[group]
+    if isinstance(grouping.dtype, pd.CategoricalDtype):
+        levels = list(grouping.cat.categories)
+        codes = grouping.cat.codes.to_numpy()
+    else:
+        codes, uniques = pd.factorize(grouping, sort=True)
+        levels = list(uniques)
+    count, mean, var = group_moments(values, codes, len(levels))
+
+    if pairs is None:
+        pairs = list(combinations(levels, 2))
+    position = {level: i for i, level in enumerate(levels)}
+    idx_a = np.array([position[a] for a, _ in pairs], dtype=int)
+    idx_b = np.array([position[b] for _, b in pairs], dtype=int)
+
+    stats_by_pair = _welch_from_moments(
+        count[idx_a], mean[idx_a], var[idx_a], count[idx_b], mean[idx_b], var[idx_b]
+    )
+    index = pd.MultiIndex.from_tuples(
+        [(f"{a} vs {b}", metric) for a, b in pairs for metric in metrics],
+        names=['comparison', 'metric'],
+    )
+    result = pd.DataFrame({key: np.ravel(value) for key, value in stats_by_pair.items()}, index=index)
+    if correction:
+        result['p_adjusted'] = adjust_pvalues(result['p_value'].to_numpy(), correction)
+    return result
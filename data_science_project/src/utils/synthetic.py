@@ -0,0 +1,177 @@
+"""Synthetic subscriber generator matched to the training master schema.
+
+The real data files are tracked with Git LFS, so benchmarks and performance
+work use this generator instead. Column names, category sets, value ranges and
+nullable columns are read from ``training_master_schema``; the distributions
+below only shape values inside those bounds so pipeline stages see realistic
+skew, outliers and missingness.
+"""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.schema import training_master_schema
+
+
+DISTRIBUTIONS: Dict[str, Tuple] = {
+    "age": ("normal", 38.0, 12.0),
+    "tenure_months": ("exponential", 22.0),
+    "monthly_charges": ("lognormal", np.log(45.0), 0.45),
+    "support_tickets_last_6mo": ("poisson", 2.2),
+    "data_usage_gb": ("lognormal", np.log(8.0), 0.7),
+    "calls_per_month": ("poisson", 60.0),
+    "messages_per_month": ("poisson", 120.0),
+    "avg_session_minutes": ("normal", 35.0, 15.0),
+    "credit_score": ("normal", 620.0, 80.0),
+    "income": ("lognormal", np.log(900.0), 0.6),
+    "late_payments": ("poisson", 1.2),
+    "next_month_spend": ("lognormal", np.log(40.0), 0.5),
+}
+
+REVIEW_SNIPPETS = (
+    "Network drops in the evening",
+    "Great coverage and fast data",
+    "Support took too long to respond",
+    "Bundles are too expensive",
+    "Happy with the app experience",
+    "Billing errors every month",
+)
+
+SNAPSHOT_START = pd.Timestamp("2021-01-01")
+SNAPSHOT_END = pd.Timestamp("2025-09-30")
+
+
+def _bounds(column) -> Tuple[Optional[float], Optional[float], Optional[list]]:
+    """Extract (min, max, allowed values) from a pandera column's checks."""
+    low = high = allowed = None
+    for check in column.checks:
+        statistics = check.statistics or {}
+        if "allowed_values" in statistics:
+            allowed = list(statistics["allowed_values"])
+        if "min_value" in statistics:
+            low = statistics["min_value"]
+        if "max_value" in statistics:
+            high = statistics["max_value"]
+    return low, high, allowed
+
+
+def _sample(rng: np.random.Generator, spec: Tuple, size: int) -> np.ndarray:
+    kind, *params = spec
+    if kind == "normal":
+        return rng.normal(params[0], params[1], size)
+    if kind == "lognormal":
+        return rng.lognormal(params[0], params[1], size)
+    if kind == "exponential":
+        return rng.exponential(params[0], size)
+    if kind == "poisson":
+        return rng.poisson(params[0], size).astype(float)
+    raise ValueError(f"Unknown distribution: {kind}")
+
+
+def generate_subscribers(
+    n_rows: int,
+    *,
+    seed: int = 42,
+    null_rate: float = 0.05,
+    duplicate_rate: float = 0.01,
+) -> pd.DataFrame:
+    """Generate a raw-format subscriber frame with ``n_rows`` records.
+
+    ``null_rate`` applies to every column the schema marks as nullable and
+    ``duplicate_rate`` re-emits that share of customers with a different
+    ``last_seen`` so ``drop_duplicate_customers`` has work to do.
+    """
+    rng = np.random.default_rng(seed)
+    n_unique = max(1, int(round(n_rows / (1 + duplicate_rate))))
+    columns = training_master_schema.columns
+    data: Dict[str, np.ndarray] = {}
+
+    for name, column in columns.items():
+        low, high, allowed = _bounds(column)
+        if allowed is not None:
+            data[name] = rng.choice(np.asarray(allowed, dtype=object), n_unique)
+        elif name in DISTRIBUTIONS:
+            values = _sample(rng, DISTRIBUTIONS[name], n_unique)
+            data[name] = np.clip(values, low, high)
+        elif low is not None and high is not None:
+            data[name] = rng.uniform(low, high, n_unique)
+
+    data["customer_id"] = np.arange(1, n_unique + 1)
+    for name, column in columns.items():
+        if column.dtype is not None and str(column.dtype).startswith("int") and name in data:
+            data[name] = np.rint(np.asarray(data[name], dtype=float)).astype(int)
+
+    span_days = (SNAPSHOT_END - SNAPSHOT_START).days
+    last_seen_offset = rng.integers(span_days // 2, span_days, n_unique)
+    tenure_days = np.rint(data["tenure_months"] * 30.4375 + rng.normal(0, 20, n_unique))
+    data["last_seen"] = SNAPSHOT_START + pd.to_timedelta(last_seen_offset, unit="D")
+    data["signup_date"] = data["last_seen"] - pd.to_timedelta(np.clip(tenure_days, 0, None), unit="D")
+
+    data["total_charges"] = np.round(
+        data["monthly_charges"] * np.maximum(data["tenure_months"], 1) * rng.normal(1.0, 0.05, n_unique),
+        2,
+    ).clip(0)
+
+    provinces = np.asarray(_bounds(columns["province"])[2], dtype=object)
+    lat_low, lat_high, _ = _bounds(columns["lat"])
+    lng_low, lng_high, _ = _bounds(columns["lng"])
+    province_codes = rng.integers(0, len(provinces), n_unique)
+    centre_lat = np.linspace(lat_low + 1, lat_high - 1, len(provinces))[province_codes]
+    centre_lng = np.linspace(lng_low + 1, lng_high - 1, len(provinces))[province_codes]
+    data["province"] = provinces[province_codes]
+    data["lat"] = np.clip(centre_lat + rng.normal(0, 0.3, n_unique), lat_low, lat_high)
+    data["lng"] = np.clip(centre_lng + rng.normal(0, 0.3, n_unique), lng_low, lng_high)
+
+    logit = (
+        -1.0
+        + 0.35 * data["support_tickets_last_6mo"]
+        - 0.6 * data["has_app"]
+        - 0.02 * data["tenure_months"]
+        + 0.3 * (5 - data["satisfaction_score"]) / 2
+    )
+    data["churned"] = (rng.random(n_unique) < 1 / (1 + np.exp(-logit))).astype(int)
+    data["review_text"] = rng.choice(np.asarray(REVIEW_SNIPPETS, dtype=object), n_unique)
+
+    frame = pd.DataFrame({name: data[name] for name in columns})
+    for name, column in columns.items():
+        if column.nullable and null_rate > 0:
+            frame.loc[rng.random(n_unique) < null_rate, name] = None
+
+    n_duplicates = n_rows - n_unique
+    if n_duplicates > 0:
+        duplicates = frame.iloc[rng.integers(0, n_unique, n_duplicates)].copy()
+        duplicates["last_seen"] = duplicates["last_seen"] - pd.to_timedelta(
+            rng.integers(1, 90, n_duplicates), unit="D"
+        )
+        frame = pd.concat([frame, duplicates], ignore_index=True)
+    return frame
+
+
+def write_raw_csv(df: pd.DataFrame, path: Path) -> None:
+    """Write a synthetic frame in the raw feed's day-first date format."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(path, index=False, date_format="%d/%m/%Y")
+
+
+def generate_clean_subscribers(n_rows: int, *, seed: int = 42) -> pd.DataFrame:
+    """Synthetic subscribers passed through the preprocessing pipeline.
+
+    Goes through a raw CSV round trip so date parsing matches production.
+    """
+    from src.pipelines import preprocessing
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_path = Path(tmp) / "raw.csv"
+        write_raw_csv(generate_subscribers(n_rows, seed=seed), raw_path)
+        return preprocessing.run_pipeline(
+            raw_path,
+            Path(tmp) / "clean.csv",
+            Path(tmp) / "kpi_summary.json",
+            partition_root=None,
+        )
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import os
+
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -9,6 +11,13 @@ import streamlit as st
 from pathlib import Path
 from streamlit.components.v1 import html as st_html
 
+from src.pipelines.kpis import compute_kpi_summary, load_kpi_summary
+from src.pipelines.partitions import list_months, monthly_trend
+from src.reporting.aggregations import SUPPORT_BAND_OPTIONS
+from src.reporting.chart_data import PAYLOAD_BUDGET_BYTES, check_payload, scatter_figure
+from src.reporting.query_service import FilterState, QueryClient, QueryService, normalize_filters
+from src.utils.instrumentation import instrument_stage
+
 ROOT = Path(__file__).resolve().parent
 # Handle both local and deployed paths
 if (ROOT / "data_science_project").exists():
@@ -18,51 +27,151 @@ if (ROOT / "data_science_project").exists():
 DATA_PATH = ROOT / "data" / "processed" / "clean_dataset.csv"
 SEGMENTED_PATH = ROOT / "data" / "processed" / "segmented.csv"
 SEGMENT_SUMMARY_PATH = ROOT / "reports" / "segment_summary.csv"
+KPI_SUMMARY_PATH = ROOT / "reports" / "kpi_summary.json"
+PARTITIONS_PATH = ROOT / "data" / "processed" / "clean_by_month"
 REPO_URL = "https://github.com/Theoldmanname/data_science_project01_churn"
 REPO_SUBDIR = "data_science_project"
 REPO_BRANCH = "master"
 
+# Per-section caches are keyed on the normalized filter state (in front of the
+# query service); bound them so long-running deployments do not accumulate
+# one entry per filter combination.
+CACHE_TTL_SECONDS = 30 * 60
+CACHE_MAX_ENTRIES = 64
+# Shared query service (python -m src.reporting.query_service); in-process when unset.
+QUERY_SERVICE_URL = os.environ.get("CHURN_QUERY_SERVICE_URL")
+# Measure every chart's payload against the budget (also on whenever tracing is).
+CHECK_CHART_PAYLOADS = os.environ.get("CHURN_CHECK_CHART_PAYLOADS") == "1"
+
 # Provide more helpful error messages
 if not DATA_PATH.exists():
     raise FileNotFoundError(f"Required data file not found at {DATA_PATH}. Please ensure the processed data files are generated.")
 
 
-@st.cache_data(show_spinner=False)
+@st.cache_resource(show_spinner=False)
 def load_data() -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Load the datasets once per process; frames are shared read-only across sessions."""
     clean = pd.read_csv(DATA_PATH, parse_dates=["signup_date", "last_seen"])
     segmented = pd.read_csv(SEGMENTED_PATH, parse_dates=["signup_date", "last_seen"])
     segment_summary = pd.read_csv(SEGMENT_SUMMARY_PATH)
     return clean, segmented, segment_summary
 
 
-def layout_header(clean: pd.DataFrame) -> None:
+@st.cache_data(show_spinner=False)
+def load_kpis() -> dict:
+    """Read the pipeline KPI summary, computing it once if the artifact is missing."""
+    if KPI_SUMMARY_PATH.exists():
+        return load_kpi_summary(KPI_SUMMARY_PATH)
+    clean, _, _ = load_data()
+    return compute_kpi_summary(clean)
+
+
+@st.cache_resource(show_spinner=False)
+def query_backend() -> QueryService | QueryClient:
+    """Filtered aggregates shared by every session (remote when a service URL is set).
+
+    The section helpers below memoise its answers per filter state, so a
+    rerun only reaches the backend for states this process has not seen.
+    """
+    if QUERY_SERVICE_URL:
+        return QueryClient(QUERY_SERVICE_URL)
+    clean, _, _ = load_data()
+    return QueryService(clean)
+
+
+@st.cache_data(show_spinner=False, ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES)
+def customer_count(state: FilterState) -> int:
+    return int(query_backend().query("count", *state)["customers"].iloc[0])
+
+
+@st.cache_data(show_spinner=False, ttl=CACHE_TTL_SECONDS)
+def stored_months() -> list[str]:
+    """Months in the partitioned store written by the pipeline (empty without one)."""
+    return list_months(PARTITIONS_PATH)
+
+
+@st.cache_data(show_spinner=False, ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES)
+def trend_metrics(state: FilterState, start: str | None = None, end: str | None = None) -> pd.DataFrame:
+    """Monthly trend for the filters, reading only the partitions from ``start`` to ``end``.
+
+    Falls back to the query service when the partitioned store is missing.
+    """
+    if stored_months():
+        plans, provinces, support_band = state
+        return monthly_trend(
+            PARTITIONS_PATH, start=start, end=end, plans=plans, provinces=provinces, support_band=support_band
+        )
+    return query_backend().query("trend", *state)
+
+
+@st.cache_data(show_spinner=False, ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES)
+def plan_app_churn(state: FilterState) -> tuple[pd.Series, pd.Series]:
+    backend = query_backend()
+    plan_churn = backend.query("plan_churn", *state).set_index("plan_type")["churn_rate"]
+    app_churn = backend.query("app_churn", *state).set_index("has_app")["churn_rate"]
+    return plan_churn.sort_values(ascending=False), app_churn.rename({True: "Has App", False: "No App"})
+
+
+@st.cache_data(show_spinner=False, ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES)
+def support_churn_rates(state: FilterState) -> pd.Series:
+    return query_backend().query("support_churn", *state).set_index("support_segment")["churn_rate_pct"]
+
+
+@st.cache_data(show_spinner=False, ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES)
+def geo_churn_summary(state: FilterState) -> pd.DataFrame:
+    return query_backend().query("geo", *state)
+
+
+@st.cache_resource(show_spinner=False, ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES)
+def cluster_members(cluster) -> pd.DataFrame:
+    _, segmented, _ = load_data()
+    return segmented[segmented["cluster"] == cluster]
+
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def load_eda_report() -> str:
+    return (ROOT / "reports" / "eda_report.html").read_text(encoding="utf-8")
+
+
+def show_chart(name: str, fig: go.Figure) -> None:
+    """Render a Plotly chart and flag it when a measured payload exceeds the budget."""
+    size = check_payload(name, fig, force=CHECK_CHART_PAYLOADS)
+    st.plotly_chart(fig, use_container_width=True)
+    if size is not None and size > PAYLOAD_BUDGET_BYTES:
+        st.caption(
+            f"Chart payload {size / 1e6:.1f} MB exceeds the {PAYLOAD_BUDGET_BYTES / 1e6:.1f} MB budget."
+        )
+
+
+@instrument_stage("dashboard")
+def layout_header(kpis: dict) -> None:
     st.title("Telecom Retention & Growth Dashboard")
     st.caption(
         "Executive dashboard extracted from the full data science case study. "
         "Use the controls to explore churn, spend, and segment insights."
     )
 
-    churn_rate = clean["churned"].mean() * 100
-    app_adoption = clean["has_app"].mean() * 100
-    high_support = (clean["support_tickets_per_month"] >= 0.5).mean() * 100
-    next_month_spend = clean["next_month_spend"].mean()
+    churn_rate = kpis["churn_rate"]["value"] * 100
+    app_adoption = kpis["app_adoption"]["value"] * 100
+    next_month_spend = kpis["next_month_spend"]["value"]
 
     col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Customers Analysed", f"{len(clean):,}")
+    col1.metric("Customers Analysed", f"{kpis['customers']:,}")
     col2.metric("Churn Rate", f"{churn_rate:.1f}%")
     col3.metric("App Adoption", f"{app_adoption:.1f}%")
     col4.metric("Avg Next-Month Spend", f"$ {next_month_spend:.2f}")
 
 
-def section_kpi_table(clean: pd.DataFrame) -> None:
+@instrument_stage("dashboard")
+def section_kpi_table(kpis: dict) -> None:
     st.subheader("Executive KPI Highlights")
     metrics = {
-        "Total Customers": f"{len(clean):,}",
-        "Churn Rate": f"{clean['churned'].mean() * 100:.1f}%",
-        "App Adoption": f"{clean['has_app'].mean() * 100:.1f}%",
-        "High Support Load (>=0.5 tickets/mo)": f"{(clean['support_tickets_per_month'] >= 0.5).mean() * 100:.1f}%",
-        "Average Monthly Revenue": f"$ {clean['avg_monthly_revenue'].mean():.2f}",
-        "Next-Month Spend Forecast": f"$ {clean['next_month_spend'].mean():.2f}",
+        "Total Customers": f"{kpis['customers']:,}",
+        "Churn Rate": f"{kpis['churn_rate']['value'] * 100:.1f}%",
+        "App Adoption": f"{kpis['app_adoption']['value'] * 100:.1f}%",
+        "High Support Load (>=0.5 tickets/mo)": f"{kpis['high_support_share']['value'] * 100:.1f}%",
+        "Average Monthly Revenue": f"$ {kpis['avg_monthly_revenue']['value']:.2f}",
+        "Next-Month Spend Forecast": f"$ {kpis['next_month_spend']['value']:.2f}",
     }
     table_df = pd.DataFrame(list(metrics.items()), columns=["KPI", "Value"])
     fig = go.Figure(
@@ -74,10 +183,12 @@ def section_kpi_table(clean: pd.DataFrame) -> None:
         ]
     )
     fig.update_layout(margin=dict(l=0, r=0, t=10, b=0), height=250)
-    st.plotly_chart(fig, use_container_width=True)
+    show_chart("kpi_table", fig)
 
 
-def section_filters(clean: pd.DataFrame) -> pd.DataFrame:
+@instrument_stage("dashboard")
+def section_filters(clean: pd.DataFrame) -> FilterState:
+    """Render the sidebar filters and return their normalized state."""
     st.sidebar.header("Filters")
     plan = st.sidebar.multiselect(
         "Plan Type", options=sorted(clean["plan_type"].unique()), default=None
@@ -85,43 +196,19 @@ def section_filters(clean: pd.DataFrame) -> pd.DataFrame:
     province = st.sidebar.multiselect(
         "Province", options=sorted(clean["province"].unique()), default=None
     )
-    support_band = st.sidebar.selectbox(
-        "Support Intensity",
-        options=[
-            "All",
-            "Low (<=0.2 tickets/mo)",
-            "Moderate (0.2-0.5 tickets/mo)",
-            "High (>=0.5 tickets/mo)",
-        ],
-    )
+    support_band = st.sidebar.selectbox("Support Intensity", options=SUPPORT_BAND_OPTIONS)
+    return normalize_filters(plan, province, support_band)
+
 
-    filtered = clean.copy()
-    if plan:
-        filtered = filtered[filtered["plan_type"].isin(plan)]
-    if province:
-        filtered = filtered[filtered["province"].isin(province)]
-    if support_band != "All":
-        if support_band.startswith("Low"):
-            filtered = filtered[filtered["support_tickets_per_month"] <= 0.2]
-        elif support_band.startswith("Moderate"):
-            filtered = filtered[
-                (filtered["support_tickets_per_month"] > 0.2)
-                & (filtered["support_tickets_per_month"] < 0.5)
-            ]
-        else:
-            filtered = filtered[filtered["support_tickets_per_month"] >= 0.5]
-    return filtered
-
-
-def section_trends(filtered: pd.DataFrame, title_suffix: str) -> None:
+@st.fragment
+@instrument_stage("dashboard")
+def section_trends(state: FilterState, title_suffix: str) -> None:
     st.subheader("Churn & Spend Trends")
-    metrics = (
-        filtered.assign(month=filtered["last_seen"].dt.to_period("M"))
-        .groupby("month")
-        .agg(churn_rate=("churned", "mean"), next_spend=("next_month_spend", "mean"))
-        .reset_index()
-    )
-    metrics["month"] = metrics["month"].dt.to_timestamp()
+    months = stored_months()
+    start, end = (months[0], months[-1]) if months else (None, None)
+    if len(months) > 1:
+        start, end = st.select_slider("Months", options=months, value=(start, end), key="trend_months")
+    metrics = trend_metrics(state, start, end)
 
     fig = go.Figure()
     fig.add_trace(
@@ -153,63 +240,44 @@ def section_trends(filtered: pd.DataFrame, title_suffix: str) -> None:
         legend=dict(orientation="h", y=1.15, x=0.05),
         margin=dict(l=30, r=30, t=60, b=30),
     )
-    st.plotly_chart(fig, use_container_width=True)
+    show_chart("trend", fig)
 
 
-def section_plan_app(filtered: pd.DataFrame) -> None:
+@st.fragment
+@instrument_stage("dashboard")
+def section_plan_app(state: FilterState) -> None:
+    plan_churn, app_churn = plan_app_churn(state)
     col1, col2 = st.columns(2)
     with col1:
         st.markdown("**Churn by Plan Tier**")
-        plan_churn = (
-            filtered.groupby("plan_type")["churned"].mean().sort_values(ascending=False)
-        )
         fig = px.bar(
             plan_churn * 100,
             labels={"value": "Churn Rate (%)", "index": "Plan Type"},
             color=plan_churn.index,
         )
         fig.update_layout(showlegend=False, margin=dict(l=10, r=10, t=40, b=10))
-        st.plotly_chart(fig, use_container_width=True)
+        show_chart("plan_churn", fig)
 
     with col2:
         st.markdown("**Churn by App Adoption**")
-        app_churn = filtered.groupby("has_app")["churned"].mean().rename(
-            {True: "Has App", False: "No App"}
-        )
         fig = px.bar(
             app_churn * 100,
             labels={"value": "Churn Rate (%)", "index": "Segment"},
             color=app_churn.index,
         )
         fig.update_layout(showlegend=False, margin=dict(l=10, r=10, t=40, b=10))
-    st.plotly_chart(fig, use_container_width=True)
+    show_chart("app_churn", fig)
 
 
-def section_support_churn(filtered: pd.DataFrame) -> None:
+@st.fragment
+@instrument_stage("dashboard")
+def section_support_churn(state: FilterState, n_filtered: int) -> None:
     st.subheader("Support Load vs Churn")
-    if filtered.empty:
+    if n_filtered == 0:
         st.info("No data available for the current filter selection.")
         return
 
-    max_support = filtered["support_tickets_per_month"].max()
-    if pd.isna(max_support):
-        st.info("Support information unavailable for the selected filters.")
-        return
-
-    upper_bound = max(1.51, float(max_support) + 0.01)
-    support_bins = pd.cut(
-        filtered["support_tickets_per_month"],
-        bins=[-0.01, 0.2, 0.5, 1.5, upper_bound],
-        labels=["0-0.2", "0.2-0.5", "0.5-1.5", ">1.5"],
-    )
-    support_churn = (
-        filtered.assign(support_segment=support_bins)
-        .groupby("support_segment", observed=False)["churned"]
-        .mean()
-        .mul(100)
-        .reindex(["0-0.2", "0.2-0.5", "0.5-1.5", ">1.5"])
-        .dropna()
-    )
+    support_churn = support_churn_rates(state)
     if support_churn.empty:
         st.info("No support ticket data available for charting.")
         return
@@ -222,10 +290,13 @@ def section_support_churn(filtered: pd.DataFrame) -> None:
         color_continuous_scale="magma",
     )
     fig.update_layout(showlegend=False, margin=dict(l=10, r=10, t=40, b=10))
-    st.plotly_chart(fig, use_container_width=True)
+    show_chart("support_churn", fig)
 
 
-def section_segments(segmented: pd.DataFrame, summary: pd.DataFrame) -> None:
+@st.fragment
+@instrument_stage("dashboard")
+def section_segments() -> None:
+    _, segmented, summary = load_data()
     st.subheader("Segmentation Personas")
     st.dataframe(
         summary.rename(
@@ -245,7 +316,7 @@ def section_segments(segmented: pd.DataFrame, summary: pd.DataFrame) -> None:
     cluster = st.selectbox(
         "Choose cluster", options=sorted(segmented["cluster"].unique()), index=0
     )
-    cluster_slice = segmented[segmented["cluster"] == cluster]
+    cluster_slice = cluster_members(cluster)
     col1, col2, col3 = st.columns(3)
     col1.metric("Customers", f"{len(cluster_slice):,}")
     col2.metric(
@@ -257,42 +328,34 @@ def section_segments(segmented: pd.DataFrame, summary: pd.DataFrame) -> None:
         f"{cluster_slice['support_tickets_per_month'].mean():.2f}",
     )
 
-    fig = px.scatter(
+    fig = scatter_figure(
         cluster_slice,
-        x="pc1",
-        y="pc2",
+        "pc1",
+        "pc2",
         color="retention_segment",
-        hover_data=["customer_id", "monthly_charges", "next_month_spend"],
+        hover=["customer_id", "monthly_charges", "next_month_spend"],
+        mean_columns=["monthly_charges", "next_month_spend"],
         labels={"pc1": "PC 1", "pc2": "PC 2", "retention_segment": "Retention Segment"},
     )
     fig.update_layout(margin=dict(l=10, r=10, t=40, b=10))
-    st.plotly_chart(fig, use_container_width=True)
+    show_chart("cluster_scatter", fig)
 
 
-def section_geo_churn(filtered: pd.DataFrame) -> None:
+@st.fragment
+@instrument_stage("dashboard")
+def section_geo_churn(state: FilterState, n_filtered: int) -> None:
     st.subheader("Provincial Churn Hotspots")
-    if filtered.empty:
+    if n_filtered == 0:
         st.info("No data available for the current filter selection.")
         return
 
-    province_summary = (
-        filtered.groupby("province")
-        .agg(
-            customers=("customer_id", "count"),
-            churn_rate=("churned", "mean"),
-            lat=("lat", "mean"),
-            lng=("lng", "mean"),
-        )
-        .dropna(subset=["lat", "lng"])
-        .reset_index()
-    )
-    province_summary["churn_rate_pct"] = province_summary["churn_rate"] * 100
-    if province_summary.empty:
+    geo_summary = geo_churn_summary(state)
+    if geo_summary.empty:
         st.info("Geographic information unavailable for the selected filters.")
         return
 
     fig = px.scatter_geo(
-        province_summary,
+        geo_summary,
         lat="lat",
         lon="lng",
         size="customers",
@@ -310,9 +373,11 @@ def section_geo_churn(filtered: pd.DataFrame) -> None:
         title="Customer footprint — bubble size reflects customer count, color reflects churn rate",
         margin=dict(l=0, r=0, t=50, b=0),
     )
-    st.plotly_chart(fig, use_container_width=True)
+    show_chart("geo_churn", fig)
 
 
+@st.fragment
+@instrument_stage("dashboard")
 def section_resources() -> None:
     st.subheader("Reports & Downloads")
     pages_base = "https://Theoldmanname.github.io/data_science_project01_churn"
@@ -327,30 +392,32 @@ def section_resources() -> None:
         """
     )
 
-    with st.expander("Preview EDA report inline"):
+    # A toggle (unlike an expander) skips the body while closed, so the large
+    # report is only read and shipped to the browser once requested.
+    if st.toggle("Preview EDA report inline"):
         try:
-            eda_html = (ROOT / "reports" / "eda_report.html").read_text(
-                encoding="utf-8"
-            )
-            st_html(eda_html, height=600, scrolling=True)
+            st_html(load_eda_report(), height=600, scrolling=True)
         except FileNotFoundError:
             st.info("EDA report not found locally. Ensure `reports/eda_report.html` exists.")
 
 
+@instrument_stage("dashboard", profile=False)
 def main() -> None:
-    clean, segmented, summary = load_data()
-    layout_header(clean)
-    section_kpi_table(clean)
-    filtered = section_filters(clean)
+    clean, _, _ = load_data()
+    kpis = load_kpis()
+    layout_header(kpis)
+    section_kpi_table(kpis)
+    state = section_filters(clean)
 
     title_suffix = ""
-    if len(filtered) != len(clean):
-        title_suffix = f"(Filtered sample: {len(filtered):,} customers)"
-    section_trends(filtered, title_suffix)
-    section_plan_app(filtered)
-    section_support_churn(filtered)
-    section_geo_churn(filtered)
-    section_segments(segmented, summary)
+    n_filtered = customer_count(state)
+    if n_filtered != len(clean):
+        title_suffix = f"(Filtered sample: {n_filtered:,} customers)"
+    section_trends(state, title_suffix)
+    section_plan_app(state)
+    section_support_churn(state, n_filtered)
+    section_geo_churn(state, n_filtered)
+    section_segments()
     section_resources()
 
     st.markdown("---")